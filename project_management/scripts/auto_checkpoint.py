@@ -18,6 +18,8 @@ from pathlib import Path
 import hashlib
 import logging
 
+import json_utils
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -260,13 +262,8 @@ class AutoCheckpointDaemon:
                 }
             }
 
-            with open(checkpoint_file, 'w', encoding='utf-8') as f:
-                json.dump(checkpoint_data, f, indent=2, ensure_ascii=False)
-
-            # Update state with checkpoint info
-            if "checkpoints" not in state:
-                state["checkpoints"] = []
-            state["checkpoints"].append(checkpoint)
+            with open(checkpoint_file, 'wb') as f:
+                f.write(json_utils.dumps(checkpoint_data, indent=True))
 
             # Update automation metadata
             if "automation" not in state:
@@ -284,8 +281,8 @@ class AutoCheckpointDaemon:
             state["recovery"]["rollback_available"] = True
 
             # Save updated state
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(state, f, indent=2, ensure_ascii=False)
+            with open(self.state_file, 'wb') as f:
+                f.write(json_utils.dumps(state, indent=True))
 
             logger.info(f"Auto-checkpoint {checkpoint_id} created successfully ({reason})")
 
@@ -17,6 +17,16 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
 import logging
 
+import json_utils
+from checkpoint_store import CheckpointStore
+
+# Optional streaming JSON parser for large legacy checkpoint files
+try:
+    import ijson
+    IJSON_SUPPORT = True
+except ImportError:
+    IJSON_SUPPORT = False
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -44,28 +54,24 @@ class CheckpointRecoveryManager:
         self.snapshots_dir.mkdir(exist_ok=True)
         self.backup_dir.mkdir(exist_ok=True)
 
+        self.checkpoint_store = CheckpointStore(self.checkpoints_dir)
+
     def list_checkpoints(self) -> List[Dict[str, Any]]:
         """List all available checkpoints with metadata."""
         checkpoints = []
 
         try:
+            # Checkpoints in the aggregated log
+            for offset, length in self.checkpoint_store.load_index().values():
+                data = self.checkpoint_store.read_at(offset, length)
+                checkpoints.append(self._summarize_checkpoint(
+                    data.get('checkpoint', {}), self.checkpoint_store.log_file, length))
+
+            # Legacy one-file-per-checkpoint entries
             for checkpoint_file in self.checkpoints_dir.glob('*.json'):
-                with open(checkpoint_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    checkpoint_info = data.get('checkpoint', {})
-
-                    checkpoints.append({
-                        'id': checkpoint_info.get('checkpoint_id', 'UNKNOWN'),
-                        'timestamp': checkpoint_info.get('timestamp', ''),
-                        'description': checkpoint_info.get('description', ''),
-                        'type': checkpoint_info.get('type', 'MANUAL'),
-                        'phase': checkpoint_info.get('phase', 0),
-                        'task': checkpoint_info.get('task', ''),
-                        'progress': checkpoint_info.get('completion_percentage', 0),
-                        'file': str(checkpoint_file),
-                        'file_size': checkpoint_file.stat().st_size,
-                        'validation_status': checkpoint_info.get('validation_status', 'UNKNOWN')
-                    })
+                checkpoints.append(self._summarize_checkpoint(
+                    self._read_checkpoint_info(checkpoint_file), checkpoint_file,
+                    checkpoint_file.stat().st_size))
 
         except Exception as e:
             logger.error(f"Error listing checkpoints: {e}")
@@ -74,6 +80,22 @@ class CheckpointRecoveryManager:
         checkpoints.sort(key=lambda x: x['timestamp'], reverse=True)
         return checkpoints
 
+    def _summarize_checkpoint(self, checkpoint_info: Dict[str, Any],
+                              source: Path, size: int) -> Dict[str, Any]:
+        """Build the list_checkpoints entry for one checkpoint record."""
+        return {
+            'id': checkpoint_info.get('checkpoint_id', 'UNKNOWN'),
+            'timestamp': checkpoint_info.get('timestamp', ''),
+            'description': checkpoint_info.get('description', ''),
+            'type': checkpoint_info.get('type', 'MANUAL'),
+            'phase': checkpoint_info.get('phase', 0),
+            'task': checkpoint_info.get('task', ''),
+            'progress': checkpoint_info.get('completion_percentage', 0),
+            'file': str(source),
+            'file_size': size,
+            'validation_status': checkpoint_info.get('validation_status', 'UNKNOWN')
+        }
+
     def validate_checkpoint(self, checkpoint_id: str) -> Dict[str, Any]:
         """Validate checkpoint integrity and completeness."""
         validation_result = {
@@ -87,16 +109,12 @@ class CheckpointRecoveryManager:
         }
 
         try:
-            # Find checkpoint file
-            checkpoint_file = self._find_checkpoint_file(checkpoint_id)
-            if not checkpoint_file:
+            # Load checkpoint data
+            checkpoint_data = self._load_checkpoint_data(checkpoint_id)
+            if checkpoint_data is None:
                 validation_result['issues'].append(f"Checkpoint file not found for {checkpoint_id}")
                 return validation_result
 
-            # Load checkpoint data
-            with open(checkpoint_file, 'r', encoding='utf-8') as f:
-                checkpoint_data = json.load(f)
-
             checkpoint_info = checkpoint_data.get('checkpoint', {})
             full_state = checkpoint_data.get('full_state', {})
 
@@ -167,10 +185,8 @@ class CheckpointRecoveryManager:
                 recovery_result['messages'].extend(validation['issues'])
                 return recovery_result
 
-            # Find checkpoint file
-            checkpoint_file = self._find_checkpoint_file(checkpoint_id)
-            with open(checkpoint_file, 'r', encoding='utf-8') as f:
-                checkpoint_data = json.load(f)
+            # Load checkpoint data
+            checkpoint_data = self._load_checkpoint_data(checkpoint_id)
 
             checkpoint_info = checkpoint_data.get('checkpoint', {})
             full_state = checkpoint_data.get('full_state', {})
@@ -184,8 +200,10 @@ class CheckpointRecoveryManager:
 
             # Restore progress state
             try:
-                # Update metadata to reflect recovery
+                # Update metadata to reflect recovery; stored snapshots omit the
+                # per-checkpoint recovery pointer, so restore it from the record
                 full_state['metadata']['last_updated'] = datetime.now(timezone.utc).isoformat()
+                full_state.setdefault('recovery', {}).setdefault('last_known_good_state', checkpoint_id)
                 full_state['current_session']['session_id'] = f"recovery_{datetime.now().strftime('%Y%m%d_%H%M')}"
                 full_state['current_session']['last_activity'] = datetime.now(timezone.utc).isoformat()
 
@@ -200,8 +218,8 @@ class CheckpointRecoveryManager:
                 })
 
                 # Save restored state
-                with open(self.state_file, 'w', encoding='utf-8') as f:
-                    json.dump(full_state, f, indent=2, ensure_ascii=False)
+                with open(self.state_file, 'wb') as f:
+                    f.write(json_utils.dumps(full_state, indent=True))
 
                 recovery_result['state_restored'] = True
                 recovery_result['messages'].append("Progress state restored successfully")
@@ -350,8 +368,8 @@ class CheckpointRecoveryManager:
             if self.state_file.exists():
                 shutil.copy2(self.state_file, backup_path)
 
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(reconstructed_state, f, indent=2, ensure_ascii=False)
+            with open(self.state_file, 'wb') as f:
+                f.write(json_utils.dumps(reconstructed_state, indent=True))
 
             rebuild_result['success'] = True
             rebuild_result['reconstruction_notes'].append("Reconstructed state saved successfully")
@@ -362,14 +380,36 @@ class CheckpointRecoveryManager:
 
         return rebuild_result
 
+    def _load_checkpoint_data(self, checkpoint_id: str) -> Optional[Dict[str, Any]]:
+        """Load a checkpoint record from the aggregated log or a legacy checkpoint file."""
+        checkpoint_data = self.checkpoint_store.load(checkpoint_id)
+        if checkpoint_data is not None:
+            return checkpoint_data
+
+        checkpoint_file = self._find_checkpoint_file(checkpoint_id)
+        if not checkpoint_file:
+            return None
+
+        with open(checkpoint_file, 'rb') as f:
+            return json_utils.loads(f.read())
+
+    def _read_checkpoint_info(self, checkpoint_file: Path) -> Dict[str, Any]:
+        """Read only the "checkpoint" section of a legacy checkpoint file.
+
+        With ijson installed the file is streamed and parsing stops once the
+        section has been read, so the embedded full_state is never built.
+        """
+        with open(checkpoint_file, 'rb') as f:
+            if IJSON_SUPPORT:
+                return next(ijson.items(f, 'checkpoint'), {})
+            return json_utils.loads(f.read()).get('checkpoint', {})
+
     def _find_checkpoint_file(self, checkpoint_id: str) -> Optional[Path]:
         """Find checkpoint file by ID."""
         for checkpoint_file in self.checkpoints_dir.glob('*.json'):
             try:
-                with open(checkpoint_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if data.get('checkpoint', {}).get('checkpoint_id') == checkpoint_id:
-                        return checkpoint_file
+                if self._read_checkpoint_info(checkpoint_file).get('checkpoint_id') == checkpoint_id:
+                    return checkpoint_file
             except Exception:
                 continue
         return None
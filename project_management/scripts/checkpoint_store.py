@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+ClaudeCode Checkpoint Store
+Aggregated, append-only storage for progress checkpoints.
+
+ABOUTME: All checkpoints live in a single checkpoints.jsonl log, one record
+per line, with a small JSON index mapping each checkpoint ID to the byte
+offset and length of its record so a single checkpoint can be read back
+without parsing the whole log. Full state snapshots are stored once per
+distinct content under states/<hash>.json and referenced from records by hash.
+"""
+
+import hashlib
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+import json_utils
+
+# Advisory file locking: fcntl on POSIX, msvcrt on Windows
+try:
+    import fcntl
+    FCNTL_SUPPORT = True
+except ImportError:
+    import msvcrt
+    FCNTL_SUPPORT = False
+
+
+class CheckpointStore:
+    """Append-only checkpoint log with an ID -> (offset, length) index."""
+
+    LOG_NAME = "checkpoints.jsonl"
+    INDEX_NAME = "checkpoints.idx"
+    LOCK_NAME = "checkpoints.lock"
+    STATES_DIR_NAME = "states"
+
+    def __init__(self, checkpoints_dir: Path):
+        """Initialize the store inside an existing checkpoints directory."""
+        self.checkpoints_dir = checkpoints_dir
+        self.log_file = checkpoints_dir / self.LOG_NAME
+        self.index_file = checkpoints_dir / self.INDEX_NAME
+        self.lock_file = checkpoints_dir / self.LOCK_NAME
+        self.states_dir = checkpoints_dir / self.STATES_DIR_NAME
+
+    def append(self, record: Dict[str, Any], state_data: Optional[bytes] = None) -> None:
+        """Append a {"checkpoint": ...} record and index it by checkpoint ID.
+
+        When serialized state bytes are given, they are stored by content hash
+        and the record gets a "state_ref" to them. The snapshot is written in
+        parallel with the log; the index is only updated once both are durable,
+        so it never points at a record or snapshot that is not on disk.
+
+        Raises ValueError if the checkpoint ID is already stored.
+        """
+        # Only checkpoint writes need a pool; keep it off the CLI startup path
+        from concurrent.futures import ThreadPoolExecutor
+
+        checkpoint_id = record["checkpoint"]["checkpoint_id"]
+        state_file = None
+        if state_data is not None:
+            record["state_ref"] = self.state_ref(state_data)
+            state_file = self.states_dir / f"{record['state_ref']}.json"
+            if state_file.exists():
+                state_file = None
+            else:
+                self.states_dir.mkdir(exist_ok=True)
+
+        data = json_utils.dumps(record) + b"\n"
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            state_write = pool.submit(json_utils.write_atomic, state_file, state_data) if state_file else None
+
+            # Serialize log appends and index updates across writers
+            with self._locked():
+                index = self.load_index()
+                if checkpoint_id in index:
+                    raise ValueError(f"Checkpoint {checkpoint_id} already exists")
+                offset = self._append_log(data)
+                if state_write is not None:
+                    state_write.result()
+                index[checkpoint_id] = [offset, len(data) - 1]
+                json_utils.write_atomic(self.index_file, json_utils.dumps(index))
+
+        json_utils.fsync_dir(self.checkpoints_dir)
+        if state_file is not None:
+            json_utils.fsync_dir(self.states_dir)
+
+    @contextmanager
+    def _locked(self):
+        """Hold an exclusive lock on the store's lock file."""
+        with open(self.lock_file, 'a+b') as f:
+            if FCNTL_SUPPORT:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if FCNTL_SUPPORT:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _append_log(self, data: bytes) -> int:
+        """Durably append one encoded record to the log and return its offset."""
+        with open(self.log_file, 'ab') as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        return offset
+
+    @staticmethod
+    def state_ref(data: bytes) -> str:
+        """Content hash used to name a serialized state snapshot."""
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def load_state(self, state_ref: str) -> Optional[Dict[str, Any]]:
+        """Load a stored state snapshot by hash, or None if it is missing."""
+        state_file = self.states_dir / f"{state_ref}.json"
+        if not state_file.exists():
+            return None
+
+        with open(state_file, 'rb') as f:
+            return json_utils.loads(f.read())
+
+    def load(self, checkpoint_id: str) -> Optional[Dict[str, Any]]:
+        """Read a checkpoint record by ID with its state_ref resolved to full_state."""
+        entry = self.load_index().get(checkpoint_id)
+        if not entry:
+            return None
+
+        record = self.read_at(*entry)
+        state_ref = record.get("state_ref")
+        if state_ref and "full_state" not in record:
+            record["full_state"] = self.load_state(state_ref) or {}
+        return record
+
+    def read_at(self, offset: int, length: int) -> Dict[str, Any]:
+        """Read and parse the record stored at a given log offset."""
+        with open(self.log_file, 'rb') as f:
+            f.seek(offset)
+            return json_utils.loads(f.read(length))
+
+    def load_index(self) -> Dict[str, List[int]]:
+        """Load the checkpoint ID index (empty when no checkpoints are stored)."""
+        if not self.index_file.exists():
+            return {}
+
+        with open(self.index_file, 'rb') as f:
+            return json_utils.loads(f.read())
+
+    def checkpoint_ids(self) -> List[str]:
+        """List stored checkpoint IDs in the order they were written."""
+        return list(self.load_index())
+
+    def highest_number(self, prefix: str = "CP") -> int:
+        """Highest N among stored IDs of the form <prefix><N>, or 0 if none."""
+        numbers = [int(cid[len(prefix):]) for cid in self.load_index()
+                   if cid.startswith(prefix) and cid[len(prefix):].isdigit()]
+        return max(numbers, default=0)
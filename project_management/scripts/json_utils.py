@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+ClaudeCode JSON Utilities
+Shared JSON encode/decode helpers for progress state and checkpoint files.
+
+ABOUTME: Uses orjson when it is installed and falls back to the standard
+library json module otherwise. Encoding always returns UTF-8 bytes so callers
+can write the result with a single binary write, atomically if needed.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Union
+
+# Optional fast JSON serialization
+try:
+    import orjson
+    ORJSON_SUPPORT = True
+except ImportError:
+    ORJSON_SUPPORT = False
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse a JSON document from bytes or str; raises json.JSONDecodeError."""
+    if ORJSON_SUPPORT:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize an object to UTF-8 JSON bytes, optionally indented by two spaces."""
+    if ORJSON_SUPPORT:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Durably replace path with data via a fsynced temp file and os.replace."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def fsync_dir(path: Path) -> None:
+    """Flush a directory entry so renames and new files inside it are durable.
+
+    A no-op where directories cannot be opened for fsync, such as Windows.
+    """
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -28,21 +28,96 @@ Features:
     - Resource optimization suggestions
 """
 
+import asyncio
+import bisect
+from array import array
 import json
+import math
+import operator
 import os
 import psutil
+import queue
 import threading
 import time
 import uuid
-from collections import defaultdict, deque
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Callable, Union
+from typing import Any, Dict, List, Optional, Callable, Set, Tuple, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
-import statistics
-import subprocess
-import platform
+
+# Optional fast JSON serialization
+try:
+    import orjson
+    ORJSON_SUPPORT = True
+except ImportError:
+    ORJSON_SUPPORT = False
+
+# Optional faster event loop for the monitoring tasks
+try:
+    import uvloop
+    UVLOOP_SUPPORT = True
+except ImportError:
+    UVLOOP_SUPPORT = False
+
+# Alert log batching; alerts arriving while the queue is full are dropped
+# from the log (they stay in AlertManager.alert_history)
+ALERT_QUEUE_SIZE = 1024
+ALERT_BATCH_SIZE = 64
+_ALERT_WRITER_STOP = object()
+
+# Append-only JSON-lines logs for reports and alerts
+LOG_MAX_FILE_SIZE_MB = 100
+
+# Threshold comparisons, resolved to a predicate once in AlertManager.set_threshold
+THRESHOLD_PREDICATES: Dict[str, Callable[[float, float], bool]] = {
+    "greater": operator.gt,
+    "less": operator.lt,
+    "equal": lambda value, threshold: math.isclose(value, threshold, rel_tol=0.0, abs_tol=0.001),
+}
+
+# Percentiles reported by MetricCollector.get_metric_stats
+STAT_PERCENTILES = (50, 90, 99)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize an object to compact JSON bytes, using orjson when available."""
+    if ORJSON_SUPPORT:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str).encode("utf-8")
+
+
+def _summarize_values(name: str, values: List[float],
+                      time_window_minutes: Optional[int]) -> Dict[str, Any]:
+    """Statistical summary of a non-empty list of metric values."""
+    count = len(values)
+    mean = math.fsum(values) / count
+
+    # One C-level sort serves min, max, median and every percentile
+    ordered = sorted(values)
+
+    return {
+        "name": name,
+        "count": count,
+        "min": ordered[0],
+        "max": ordered[-1],
+        "mean": mean,
+        "median": _percentile(ordered, 50),
+        "std_dev": math.sqrt(math.fsum((v - mean) ** 2 for v in values) / (count - 1)) if count > 1 else 0,
+        "percentiles": {f"p{pct}": _percentile(ordered, pct) for pct in STAT_PERCENTILES},
+        "latest": values[-1],
+        "first": values[0],
+        "time_range_minutes": time_window_minutes
+    }
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Linearly interpolated percentile of an already sorted, non-empty list."""
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
 
 
 class MetricType(Enum):
@@ -67,17 +142,22 @@ class PerformanceMetric:
     name: str
     value: float
     metric_type: MetricType
-    timestamp: datetime
+    timestamp_ns: int
     labels: Dict[str, str]
     unit: str = "count"
 
+    @property
+    def timestamp(self) -> datetime:
+        """Measurement time as a local datetime."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
         return {
             "name": self.name,
             "value": self.value,
             "metric_type": self.metric_type.value,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp_ns": self.timestamp_ns,
             "labels": self.labels,
             "unit": self.unit
         }
@@ -92,9 +172,14 @@ class PerformanceAlert:
     threshold_value: float
     level: AlertLevel
     message: str
-    timestamp: datetime
+    timestamp_ns: int
     resolved: bool = False
 
+    @property
+    def timestamp(self) -> datetime:
+        """Alert time as a local datetime."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
         return {
@@ -104,45 +189,218 @@ class PerformanceAlert:
             "threshold_value": self.threshold_value,
             "level": self.level.value,
             "message": self.message,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp_ns": self.timestamp_ns,
             "resolved": self.resolved
         }
 
 
+class JsonLinesLog:
+    """Append-only JSON-lines file kept open between writes and rotated by size."""
+
+    def __init__(self, path: Path, max_file_size_mb: int = LOG_MAX_FILE_SIZE_MB):
+        self.path = path
+        self.max_file_size = max_file_size_mb * 1024 * 1024
+        self._file = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def write_records(self, records: List[Any]) -> None:
+        """Append records as one JSON document per line with a single write."""
+        data = b"".join(_dumps(record) + b"\n" for record in records)
+        with self._lock:
+            self._rotate_if_needed()
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+
+    def close(self) -> None:
+        """Close the underlying file; the next write reopens it."""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def _rotate_if_needed(self) -> None:
+        """Open the log, archiving the current file first if it is over the size limit."""
+        if self._file is not None and self._size < self.max_file_size:
+            return
+
+        if self._file:
+            self._file.close()
+            self._file = None
+
+        if self.path.exists() and self.path.stat().st_size >= self.max_file_size:
+            # Several rotations can share a timestamp; number them so none
+            # overwrites an earlier archive
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            archive = self.path.with_name(f"{self.path.stem}_{timestamp}{self.path.suffix}")
+            counter = 1
+            while archive.exists():
+                archive = self.path.with_name(f"{self.path.stem}_{timestamp}_{counter}{self.path.suffix}")
+                counter += 1
+            self.path.rename(archive)
+
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+
+
+# Interned (metric type, sorted label items, unit) shared by many samples
+MetricDescriptor = Tuple[MetricType, Tuple[Tuple[str, str], ...], str]
+
+
+class MetricSeries:
+    """Bounded, time-ordered history of one metric stored as fixed-width columns.
+
+    Each sample occupies an int64 timestamp, a float64 value and a uint32 id
+    into the collector's table of interned descriptors, so no per-sample
+    Python objects are kept. PerformanceMetric objects are only built when
+    history is requested.
+    """
+
+    def __init__(self, name: str, max_history: int):
+        self.name = name
+        self.max_history = max_history
+        self.timestamps = array('q')
+        self.values = array('d')
+        self.descriptor_ids = array('I')
+
+    def __len__(self) -> int:
+        return min(len(self.values), self.max_history)
+
+    @property
+    def last_timestamp(self) -> int:
+        """Timestamp of the newest sample, or 0 when empty."""
+        return self.timestamps[-1] if self.timestamps else 0
+
+    def append(self, timestamp_ns: int, value: float, descriptor_id: int) -> None:
+        """Append a sample; timestamps must be non-decreasing."""
+        self.timestamps.append(timestamp_ns)
+        self.values.append(value)
+        self.descriptor_ids.append(descriptor_id)
+
+        # Trim in bulk once the backlog doubles so appends stay amortized O(1)
+        if len(self.values) >= 2 * self.max_history:
+            drop = len(self.values) - self.max_history
+            del self.timestamps[:drop]
+            del self.values[:drop]
+            del self.descriptor_ids[:drop]
+
+    def _start(self, cutoff_ns: int) -> int:
+        """Index of the first retained sample newer than cutoff_ns."""
+        return max(bisect.bisect_right(self.timestamps, cutoff_ns),
+                   len(self.values) - self.max_history)
+
+    def values_since(self, cutoff_ns: int = 0) -> List[float]:
+        """Return retained values newer than cutoff_ns without building metrics."""
+        return self.values[self._start(cutoff_ns):].tolist()
+
+    def window_since(self, cutoff_ns: int = 0) -> Tuple[List[int], List[float]]:
+        """Return retained (timestamps, values) newer than cutoff_ns."""
+        start = self._start(cutoff_ns)
+        return self.timestamps[start:].tolist(), self.values[start:].tolist()
+
+    def since(self, descriptors: List[MetricDescriptor],
+              cutoff_ns: int = 0) -> List[PerformanceMetric]:
+        """Materialize retained samples newer than cutoff_ns."""
+        metrics = []
+        for i in range(self._start(cutoff_ns), len(self.values)):
+            metric_type, labels, unit = descriptors[self.descriptor_ids[i]]
+            metrics.append(PerformanceMetric(
+                name=self.name,
+                value=self.values[i],
+                metric_type=metric_type,
+                timestamp_ns=self.timestamps[i],
+                labels=dict(labels),
+                unit=unit
+            ))
+        return metrics
+
+
 class MetricCollector:
     """Collects and stores performance metrics."""
 
     def __init__(self, max_history: int = 10000):
-        self.metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_history))
+        self.max_history = max_history
+        self.metrics: Dict[str, MetricSeries] = {}
+        self._descriptors: List[MetricDescriptor] = []
+        self._descriptor_ids: Dict[MetricDescriptor, int] = {}
         self.counters: Dict[str, float] = defaultdict(float)
         self.gauges: Dict[str, float] = defaultdict(float)
+        self._watchers: Dict[str, List[Callable[[str], None]]] = defaultdict(list)
         self._lock = threading.Lock()
 
+        # Counter increments accumulate here and become one sample per
+        # (name, labels) each time they are flushed into the time series
+        self._pending_counts: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._counter_lock = threading.Lock()
+
+    def watch_metric(self, name: str, callback: Callable[[str], None]) -> None:
+        """Register a callback invoked with the metric name whenever it is recorded."""
+        with self._lock:
+            if callback not in self._watchers[name]:
+                self._watchers[name].append(callback)
+
     def record_metric(self, name: str, value: float, metric_type: MetricType,
                      labels: Optional[Dict[str, str]] = None, unit: str = "count") -> None:
         """Record a performance metric."""
-        with self._lock:
-            metric = PerformanceMetric(
-                name=name,
-                value=value,
-                metric_type=metric_type,
-                timestamp=datetime.now(),
-                labels=labels or {},
-                unit=unit
-            )
+        if metric_type is MetricType.COUNTER:
+            with self._counter_lock:
+                self.counters[name] += value
 
-            self.metrics[name].append(metric)
+        with self._lock:
+            self._append_sample(name, value, metric_type,
+                                tuple(sorted(labels.items())) if labels else (), unit)
 
-            # Update aggregated values
-            if metric_type == MetricType.COUNTER:
-                self.counters[name] += value
-            elif metric_type == MetricType.GAUGE:
+            if metric_type is MetricType.GAUGE:
                 self.gauges[name] = value
 
+        self._notify_watchers([name])
+
+    def _append_sample(self, name: str, value: float, metric_type: MetricType,
+                       label_items: Tuple[Tuple[str, str], ...], unit: str) -> None:
+        """Append one sample to a metric's series; the caller holds self._lock."""
+        series = self.metrics.get(name)
+        if series is None:
+            series = self.metrics[name] = MetricSeries(name, self.max_history)
+
+        # Keep each series sorted even if the wall clock steps backwards
+        timestamp_ns = max(time.time_ns(), series.last_timestamp)
+
+        descriptor = (metric_type, label_items, unit)
+        descriptor_id = self._descriptor_ids.get(descriptor)
+        if descriptor_id is None:
+            descriptor_id = self._descriptor_ids[descriptor] = len(self._descriptors)
+            self._descriptors.append(descriptor)
+
+        series.append(timestamp_ns, value, descriptor_id)
+
+    def _notify_watchers(self, names: List[str]) -> None:
+        """Invoke watchers for recorded metrics; called without holding self._lock."""
+        for name in names:
+            for callback in self._watchers.get(name, ()):
+                callback(name)
+
     def increment_counter(self, name: str, value: float = 1.0,
                          labels: Optional[Dict[str, str]] = None) -> None:
-        """Increment a counter metric."""
-        self.record_metric(name, value, MetricType.COUNTER, labels)
+        """Increment a counter metric; the time series is sampled on flush."""
+        key = (name, tuple(sorted(labels.items())) if labels else ())
+        with self._counter_lock:
+            self._pending_counts[key] = self._pending_counts.get(key, 0.0) + value
+            self.counters[name] += value
+
+    def flush_counters(self) -> None:
+        """Append one sample per (name, labels) for counter increments since the last flush."""
+        if not self._pending_counts:
+            return
+
+        with self._counter_lock:
+            pending, self._pending_counts = self._pending_counts, {}
+
+        with self._lock:
+            for (name, label_items), delta in pending.items():
+                self._append_sample(name, delta, MetricType.COUNTER, label_items, "count")
+
+        self._notify_watchers(list(dict.fromkeys(name for name, _ in pending)))
 
     def set_gauge(self, name: str, value: float,
                   labels: Optional[Dict[str, str]] = None, unit: str = "count") -> None:
@@ -157,40 +415,49 @@ class MetricCollector:
     def get_metric_history(self, name: str,
                           time_window_minutes: Optional[int] = None) -> List[PerformanceMetric]:
         """Get metric history, optionally filtered by time window."""
+        self.flush_counters()
         with self._lock:
             if name not in self.metrics:
                 return []
 
-            metrics = list(self.metrics[name])
+            return self.metrics[name].since(self._descriptors, self._cutoff_ns(time_window_minutes))
 
-            if time_window_minutes:
-                cutoff = datetime.now() - timedelta(minutes=time_window_minutes)
-                metrics = [m for m in metrics if m.timestamp > cutoff]
+    def get_metric_values(self, name: str,
+                          time_window_minutes: Optional[int] = None) -> List[float]:
+        """Get raw metric values, optionally filtered by time window."""
+        self.flush_counters()
+        with self._lock:
+            if name not in self.metrics:
+                return []
 
-            return metrics
+            return self.metrics[name].values_since(self._cutoff_ns(time_window_minutes))
+
+    def get_metric_window(self, name: str,
+                          time_window_minutes: Optional[int] = None) -> Tuple[List[int], List[float]]:
+        """Get parallel (timestamps_ns, values) lists, optionally filtered by time window."""
+        self.flush_counters()
+        with self._lock:
+            if name not in self.metrics:
+                return [], []
+
+            return self.metrics[name].window_since(self._cutoff_ns(time_window_minutes))
+
+    @staticmethod
+    def _cutoff_ns(time_window_minutes: Optional[int]) -> int:
+        """Earliest timestamp included in a time window (0 for no window)."""
+        if not time_window_minutes:
+            return 0
+        return time.time_ns() - int(time_window_minutes * 60e9)
 
     def get_metric_stats(self, name: str,
                         time_window_minutes: Optional[int] = None) -> Dict[str, Any]:
         """Get statistical summary of a metric."""
-        history = self.get_metric_history(name, time_window_minutes)
+        values = self.get_metric_values(name, time_window_minutes)
 
-        if not history:
+        if not values:
             return {}
 
-        values = [m.value for m in history]
-
-        return {
-            "name": name,
-            "count": len(values),
-            "min": min(values),
-            "max": max(values),
-            "mean": statistics.mean(values),
-            "median": statistics.median(values),
-            "std_dev": statistics.stdev(values) if len(values) > 1 else 0,
-            "latest": values[-1],
-            "first": values[0],
-            "time_range_minutes": time_window_minutes
-        }
+        return _summarize_values(name, values, time_window_minutes)
 
 
 class SystemResourceMonitor:
@@ -202,12 +469,18 @@ class SystemResourceMonitor:
         self.monitor_thread = None
         self.monitor_interval = 5.0  # seconds
 
+        # Values that never change for the life of the process are read once
+        self._cpu_count = psutil.cpu_count()
+        self._process: Optional[psutil.Process] = None
+        self._has_loadavg = hasattr(os, 'getloadavg')
+
     def start_monitoring(self) -> None:
         """Start continuous system monitoring."""
         if self.monitoring:
             return
 
         self.monitoring = True
+        self._prime_cpu_counters()
         self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.monitor_thread.start()
 
@@ -221,25 +494,53 @@ class SystemResourceMonitor:
         """Main monitoring loop."""
         while self.monitoring:
             try:
-                self._collect_cpu_metrics()
-                self._collect_memory_metrics()
-                self._collect_disk_metrics()
-                self._collect_network_metrics()
-                self._collect_process_metrics()
-
-                time.sleep(self.monitor_interval)
+                self.collect_metrics()
             except Exception as e:
                 print(f"Error in monitoring loop: {e}")
-                time.sleep(self.monitor_interval)
+            time.sleep(self.monitor_interval)
+
+    async def monitor_async(self) -> None:
+        """Monitoring loop for use as a task on an existing event loop."""
+        self.monitoring = True
+        self._prime_cpu_counters()
+        try:
+            while self.monitoring:
+                try:
+                    self.collect_metrics()
+                except Exception as e:
+                    print(f"Error in monitoring loop: {e}")
+                await asyncio.sleep(self.monitor_interval)
+        finally:
+            self.monitoring = False
+
+    def collect_metrics(self) -> None:
+        """Collect one sample of every system metric and sample pending counters."""
+        self.collector.flush_counters()
+        self._collect_cpu_metrics()
+        self._collect_memory_metrics()
+        self._collect_disk_metrics()
+        self._collect_network_metrics()
+        self._collect_process_metrics()
+
+    def _prime_cpu_counters(self) -> None:
+        """Take baseline CPU samples so later non-blocking reads are meaningful."""
+        psutil.cpu_percent(interval=None)
+        try:
+            self._process = psutil.Process()
+            self._process.cpu_percent()
+        except Exception:
+            self._process = None  # Process metrics may not be available
+
+        # Static value: emitted once rather than on every tick
+        self.collector.set_gauge("system_cpu_count", self._cpu_count, unit="count")
 
     def _collect_cpu_metrics(self) -> None:
         """Collect CPU usage metrics."""
-        cpu_percent = psutil.cpu_percent(interval=1)
-        cpu_count = psutil.cpu_count()
-        load_avg = os.getloadavg() if hasattr(os, 'getloadavg') else (0, 0, 0)
+        # Non-blocking: usage since the previous call, one tick ago
+        cpu_percent = psutil.cpu_percent(interval=None)
+        load_avg = os.getloadavg() if self._has_loadavg else (0, 0, 0)
 
         self.collector.set_gauge("system_cpu_percent", cpu_percent, unit="percent")
-        self.collector.set_gauge("system_cpu_count", cpu_count, unit="count")
         self.collector.set_gauge("system_load_1min", load_avg[0], unit="load")
         self.collector.set_gauge("system_load_5min", load_avg[1], unit="load")
         self.collector.set_gauge("system_load_15min", load_avg[2], unit="load")
@@ -285,9 +586,11 @@ class SystemResourceMonitor:
 
     def _collect_process_metrics(self) -> None:
         """Collect current process metrics."""
-        try:
-            process = psutil.Process()
+        process = self._process
+        if process is None:
+            return
 
+        try:
             cpu_percent = process.cpu_percent()
             memory_info = process.memory_info()
             num_threads = process.num_threads()
@@ -310,45 +613,77 @@ class AlertManager:
         self.alert_history: List[PerformanceAlert] = []
         self.alert_callbacks: List[Callable[[PerformanceAlert], None]] = []
 
+        # Metrics recorded since the last check and who to tell about them
+        self._dirty: Set[str] = set()
+        self._dirty_lock = threading.Lock()
+        self._change_listener: Optional[Callable[[], None]] = None
+
     def set_threshold(self, metric_name: str, threshold_value: float,
                      comparison: str = "greater", level: AlertLevel = AlertLevel.WARNING,
                      message_template: Optional[str] = None) -> None:
         """Set an alert threshold for a metric."""
+        if comparison not in THRESHOLD_PREDICATES:
+            raise ValueError(f"Unknown threshold comparison: {comparison}")
+
         self.thresholds[metric_name] = {
             "threshold_value": threshold_value,
             "comparison": comparison,  # "greater", "less", "equal"
             "level": level,
-            "message_template": message_template or f"{metric_name} threshold exceeded"
+            "message_template": message_template or f"{metric_name} threshold exceeded",
+            "alert_key": f"{metric_name}_{comparison}_{threshold_value}",
+            "predicate": THRESHOLD_PREDICATES[comparison]
         }
+        self.collector.watch_metric(metric_name, self._mark_dirty)
+
+    def _mark_dirty(self, metric_name: str) -> None:
+        """Flag a watched metric as changed and notify the change listener."""
+        with self._dirty_lock:
+            was_clean = not self._dirty
+            self._dirty.add(metric_name)
+            listener = self._change_listener
+
+        # Only the first change since the last check needs to wake anyone
+        if was_clean and listener:
+            listener()
+
+    def set_change_listener(self, listener: Optional[Callable[[], None]]) -> None:
+        """Set a callback invoked when watched metrics change after a check."""
+        with self._dirty_lock:
+            self._change_listener = listener
+            pending = bool(self._dirty)
+
+        # Changes recorded before the listener existed still need a wakeup
+        if pending and listener:
+            listener()
+
+    def take_changes(self) -> Set[str]:
+        """Return and clear the names of watched metrics changed since the last call."""
+        with self._dirty_lock:
+            changed = self._dirty
+            self._dirty = set()
+        return changed
 
     def add_alert_callback(self, callback: Callable[[PerformanceAlert], None]) -> None:
         """Add a callback function to be called when alerts are triggered."""
         self.alert_callbacks.append(callback)
 
-    def check_thresholds(self) -> List[PerformanceAlert]:
-        """Check all metrics against their thresholds."""
+    def check_thresholds(self, metric_names: Optional[Set[str]] = None) -> List[PerformanceAlert]:
+        """Check metrics against their thresholds (all of them unless names are given)."""
         new_alerts = []
 
         for metric_name, threshold_config in self.thresholds.items():
-            latest_metrics = self.collector.get_metric_history(metric_name, time_window_minutes=1)
-
-            if not latest_metrics:
+            if metric_names is not None and metric_name not in metric_names:
                 continue
 
-            latest_value = latest_metrics[-1].value
-            threshold_value = threshold_config["threshold_value"]
-            comparison = threshold_config["comparison"]
+            latest_values = self.collector.get_metric_values(metric_name, time_window_minutes=1)
 
-            # Check if threshold is exceeded
-            threshold_exceeded = False
-            if comparison == "greater" and latest_value > threshold_value:
-                threshold_exceeded = True
-            elif comparison == "less" and latest_value < threshold_value:
-                threshold_exceeded = True
-            elif comparison == "equal" and abs(latest_value - threshold_value) < 0.001:
-                threshold_exceeded = True
+            if not latest_values:
+                continue
 
-            alert_key = f"{metric_name}_{comparison}_{threshold_value}"
+            latest_value = latest_values[-1]
+            threshold_value = threshold_config["threshold_value"]
+            threshold_exceeded = threshold_config["predicate"](latest_value, threshold_value)
+            alert_key = threshold_config["alert_key"]
 
             if threshold_exceeded:
                 if alert_key not in self.active_alerts:
@@ -364,7 +699,7 @@ class AlertManager:
                             current_value=latest_value,
                             threshold_value=threshold_value
                         ),
-                        timestamp=datetime.now()
+                        timestamp_ns=time.time_ns()
                     )
 
                     self.active_alerts[alert_key] = alert
@@ -396,20 +731,28 @@ class PerformanceAnalyzer:
     def analyze_trends(self, metric_name: str,
                       time_window_hours: int = 24) -> Dict[str, Any]:
         """Analyze trends for a specific metric."""
-        history = self.collector.get_metric_history(metric_name, time_window_hours * 60)
+        values = self.collector.get_metric_values(metric_name, time_window_hours * 60)
+        return self._trend_from_values(metric_name, values, time_window_hours)
 
-        if len(history) < 2:
+    def identify_anomalies(self, metric_name: str,
+                          sensitivity: float = 2.0) -> List[Dict[str, Any]]:
+        """Identify anomalies in metric data using statistical methods."""
+        timestamps, values = self.collector.get_metric_window(metric_name, 60)  # Last hour
+        return self._anomalies_from_values(timestamps, values, sensitivity)
+
+    @staticmethod
+    def _trend_from_values(metric_name: str, values: List[float],
+                           time_window_hours: int) -> Dict[str, Any]:
+        """Least-squares trend of values against their sample index."""
+        if len(values) < 2:
             return {"error": "Insufficient data for trend analysis"}
 
-        values = [m.value for m in history]
-        timestamps = [m.timestamp for m in history]
-
-        # Simple linear trend calculation
+        # Simple linear trend calculation; the index sums have closed forms
         n = len(values)
-        sum_x = sum(range(n))
-        sum_y = sum(values)
-        sum_xy = sum(i * values[i] for i in range(n))
-        sum_x2 = sum(i * i for i in range(n))
+        sum_x = n * (n - 1) // 2
+        sum_y = math.fsum(values)
+        sum_xy = math.fsum(i * v for i, v in enumerate(values))
+        sum_x2 = (n - 1) * n * (2 * n - 1) // 6
 
         slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
         intercept = (sum_y - slope * sum_x) / n
@@ -434,28 +777,28 @@ class PerformanceAnalyzer:
             "percent_change": ((values[-1] - values[0]) / values[0]) * 100 if values[0] != 0 else 0
         }
 
-    def identify_anomalies(self, metric_name: str,
-                          sensitivity: float = 2.0) -> List[Dict[str, Any]]:
-        """Identify anomalies in metric data using statistical methods."""
-        history = self.collector.get_metric_history(metric_name, 60)  # Last hour
-
-        if len(history) < 10:
+    @staticmethod
+    def _anomalies_from_values(timestamps: List[int], values: List[float],
+                               sensitivity: float) -> List[Dict[str, Any]]:
+        """Samples whose z-score exceeds the sensitivity."""
+        if len(values) < 10:
             return []
 
-        values = [m.value for m in history]
-        mean_val = statistics.mean(values)
-        std_dev = statistics.stdev(values) if len(values) > 1 else 0
+        mean_val = math.fsum(values) / len(values)
+        std_dev = math.sqrt(math.fsum((v - mean_val) ** 2 for v in values) / (len(values) - 1))
+        if std_dev == 0:
+            return []
 
         anomalies = []
-        for i, metric in enumerate(history):
-            z_score = abs(metric.value - mean_val) / std_dev if std_dev > 0 else 0
+        for timestamp_ns, value in zip(timestamps, values):
+            z_score = abs(value - mean_val) / std_dev
 
             if z_score > sensitivity:
                 anomalies.append({
-                    "timestamp": metric.timestamp.isoformat(),
-                    "value": metric.value,
+                    "timestamp_ns": timestamp_ns,
+                    "value": value,
                     "z_score": z_score,
-                    "deviation_from_mean": metric.value - mean_val
+                    "deviation_from_mean": value - mean_val
                 })
 
         return anomalies
@@ -463,8 +806,9 @@ class PerformanceAnalyzer:
     def generate_performance_report(self,
                                    time_window_hours: int = 24) -> Dict[str, Any]:
         """Generate comprehensive performance report."""
+        now_ns = time.time_ns()
         report = {
-            "report_timestamp": datetime.now().isoformat(),
+            "report_timestamp_ns": now_ns,
             "time_window_hours": time_window_hours,
             "system_health": {},
             "performance_trends": {},
@@ -482,19 +826,19 @@ class PerformanceAnalyzer:
         ]
 
         for metric in key_metrics:
-            # Get basic stats
-            stats = self.collector.get_metric_stats(metric, time_window_hours * 60)
-            if stats:
-                report["system_health"][metric] = stats
+            # Fetch the window once; stats, trends and anomalies all read from it
+            timestamps, values = self.collector.get_metric_window(metric, time_window_hours * 60)
+            if not values:
+                continue
 
-                # Analyze trends
-                trends = self.analyze_trends(metric, time_window_hours)
-                report["performance_trends"][metric] = trends
+            report["system_health"][metric] = _summarize_values(metric, values, time_window_hours * 60)
+            report["performance_trends"][metric] = self._trend_from_values(metric, values, time_window_hours)
 
-                # Find anomalies
-                anomalies = self.identify_anomalies(metric)
-                if anomalies:
-                    report["anomalies"][metric] = anomalies
+            # Anomalies cover the last hour, which is a suffix of the report window
+            start = bisect.bisect_right(timestamps, now_ns - int(3600e9))
+            anomalies = self._anomalies_from_values(timestamps[start:], values[start:], 2.0)
+            if anomalies:
+                report["anomalies"][metric] = anomalies
 
         # Generate recommendations
         report["recommendations"] = self._generate_recommendations(report)
@@ -553,12 +897,24 @@ class PerformanceMonitor:
         # Configuration
         self.monitoring_active = False
         self.report_interval_minutes = 60
-        self.report_thread = None
+        self.alert_check_timeout = 30.0  # seconds between idle wakeups
+
+        # System sampling, reporting and alert checking share one event loop thread
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._main_task: Optional[asyncio.Future] = None
 
         # Set default thresholds
         self._set_default_thresholds()
 
-        # Add default alert callback
+        # Reports and alerts are appended to long-lived JSON-lines logs
+        self._report_log = JsonLinesLog(self.log_dir / "performance_reports.jsonl")
+        self._alert_log = JsonLinesLog(self.log_dir / "alerts.jsonl")
+
+        # Add default alert callback; while monitoring, alerts are persisted by
+        # a background writer started and stopped with the monitoring loop
+        self._alert_queue: "queue.Queue[PerformanceAlert]" = queue.Queue(maxsize=ALERT_QUEUE_SIZE)
+        self._alert_writer: Optional[threading.Thread] = None
         self.alert_manager.add_alert_callback(self._handle_alert)
 
     def _set_default_thresholds(self) -> None:
@@ -572,10 +928,73 @@ class PerformanceMonitor:
         """Default alert handler."""
         print(f"🚨 ALERT [{alert.level.value.upper()}]: {alert.message}")
 
-        # Log to file
-        alert_log_file = self.log_dir / "alerts.jsonl"
-        with open(alert_log_file, "a") as f:
-            f.write(json.dumps(alert.to_dict()) + "\n")
+        if self._alert_writer is None:
+            # Not monitoring: no event loop to stall, so write inline
+            self._write_alerts([alert])
+            return
+
+        # Queue for the background writer; never block the event loop
+        try:
+            self._alert_queue.put_nowait(alert)
+        except queue.Full:
+            print(f"Alert log queue full, alert not logged: {alert.alert_id}")
+
+    def _write_alerts(self, alerts: List[PerformanceAlert]) -> None:
+        """Append alerts to the alert log, reporting rather than raising errors."""
+        try:
+            self._alert_log.write_records([alert.to_dict() for alert in alerts])
+        except Exception as e:
+            print(f"Error writing alert log: {e}")
+
+    def _alert_writer_loop(self) -> None:
+        """Drain queued alerts into the alert log in batches until told to stop."""
+        stop = False
+        while not stop:
+            batch = [self._alert_queue.get()]
+            while len(batch) < ALERT_BATCH_SIZE:
+                try:
+                    batch.append(self._alert_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            alerts = [item for item in batch if item is not _ALERT_WRITER_STOP]
+            stop = len(alerts) != len(batch)
+            try:
+                if alerts:
+                    self._write_alerts(alerts)
+            finally:
+                for _ in batch:
+                    self._alert_queue.task_done()
+
+    def _start_alert_writer(self) -> None:
+        """Start the background alert writer thread."""
+        self._alert_writer = threading.Thread(target=self._alert_writer_loop, daemon=True)
+        self._alert_writer.start()
+
+    def _stop_alert_writer(self) -> None:
+        """Stop the alert writer once everything queued before now is written."""
+        writer, self._alert_writer = self._alert_writer, None
+        if writer is None:
+            return
+
+        # The sentinel is queued behind every pending alert, so they drain first
+        self._alert_queue.put(_ALERT_WRITER_STOP)
+        writer.join()
+
+        # Alerts queued after the sentinel by a racing callback are written here
+        leftovers = []
+        while True:
+            try:
+                leftovers.append(self._alert_queue.get_nowait())
+            except queue.Empty:
+                break
+            self._alert_queue.task_done()
+        if leftovers:
+            self._write_alerts(leftovers)
+
+    def flush_alerts(self) -> None:
+        """Block until all queued alerts have been written to the alert log."""
+        self._alert_queue.join()
 
     def start_monitoring(self) -> None:
         """Start comprehensive performance monitoring."""
@@ -585,16 +1004,13 @@ class PerformanceMonitor:
         print(f"🔍 Starting performance monitoring for {self.project_name}")
 
         self.monitoring_active = True
+        self._start_alert_writer()
 
-        # Start system monitoring
-        self.system_monitor.start_monitoring()
-
-        # Start periodic reporting
-        self.report_thread = threading.Thread(target=self._report_loop, daemon=True)
-        self.report_thread.start()
-
-        # Start alert checking
-        self._start_alert_checking()
+        self._loop = uvloop.new_event_loop() if UVLOOP_SUPPORT else asyncio.new_event_loop()
+        started = threading.Event()
+        self._loop_thread = threading.Thread(target=self._run_loop, args=(started,), daemon=True)
+        self._loop_thread.start()
+        started.wait()
 
     def stop_monitoring(self) -> None:
         """Stop performance monitoring."""
@@ -605,44 +1021,67 @@ class PerformanceMonitor:
 
         self.monitoring_active = False
 
-        # Stop system monitoring
-        self.system_monitor.stop_monitoring()
-
-        # Wait for report thread
-        if self.report_thread:
-            self.report_thread.join(timeout=5.0)
+        # Cancel the monitoring tasks and wait for the loop thread to exit
+        if self._loop and self._main_task:
+            self._loop.call_soon_threadsafe(self._main_task.cancel)
+        if self._loop_thread:
+            self._loop_thread.join(timeout=5.0)
+
+        # Make sure pending alerts reach the log, then stop the writer
+        self._stop_alert_writer()
+        self._report_log.close()
+        self._alert_log.close()
+
+    def _run_loop(self, started: threading.Event) -> None:
+        """Run the monitoring tasks on this thread's event loop until cancelled."""
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        try:
+            self._main_task = asyncio.gather(
+                self.system_monitor.monitor_async(),
+                self._report_loop(),
+                self._alert_check_loop(),
+            )
+            started.set()
+            loop.run_until_complete(self._main_task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            started.set()
+            self.alert_manager.set_change_listener(None)
+            loop.close()
+
+    async def _alert_check_loop(self) -> None:
+        """Check thresholds whenever a thresholded metric is recorded."""
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        self.alert_manager.set_change_listener(lambda: loop.call_soon_threadsafe(changed.set))
 
-    def _start_alert_checking(self) -> None:
-        """Start periodic alert checking."""
-        def alert_check_loop():
-            while self.monitoring_active:
-                try:
-                    self.alert_manager.check_thresholds()
-                    time.sleep(30)  # Check every 30 seconds
-                except Exception as e:
-                    print(f"Error in alert checking: {e}")
-                    time.sleep(30)
+        while self.monitoring_active:
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=self.alert_check_timeout)
+            except asyncio.TimeoutError:
+                pass
 
-        alert_thread = threading.Thread(target=alert_check_loop, daemon=True)
-        alert_thread.start()
+            changed.clear()
+            try:
+                metric_names = self.alert_manager.take_changes()
+                if metric_names:
+                    self.alert_manager.check_thresholds(metric_names)
+            except Exception as e:
+                print(f"Error in alert checking: {e}")
 
-    def _report_loop(self) -> None:
+    async def _report_loop(self) -> None:
         """Periodic performance reporting loop."""
         while self.monitoring_active:
             try:
-                # Generate and save performance report
+                # Generate and append performance report
                 report = self.analyzer.generate_performance_report(1)  # Last hour
-
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                report_file = self.log_dir / f"performance_report_{timestamp}.json"
-
-                with open(report_file, "w") as f:
-                    json.dump(report, f, indent=2, default=str)
-
-                time.sleep(self.report_interval_minutes * 60)
+                self._report_log.write_records([report])
             except Exception as e:
                 print(f"Error in reporting loop: {e}")
-                time.sleep(self.report_interval_minutes * 60)
+
+            await asyncio.sleep(self.report_interval_minutes * 60)
 
     def time_operation(self, operation_name: str):
         """Context manager for timing operations."""
@@ -7,13 +7,80 @@ ABOUTME: This script provides the executable implementation of the progress
 continuity system, enabling seamless session resumption across context boundaries.
 """
 
+import argparse
+import functools
 import json
-import os
+import re
 import sys
-from datetime import datetime, timezone
+import time
 from pathlib import Path
 from typing import Dict, Any, Optional, List
-import hashlib
+
+import json_utils
+from checkpoint_store import CheckpointStore
+
+# Slug normalization patterns
+_SLUG_STRIP = re.compile(r'[^\w\s-]')
+_SLUG_DASH = re.compile(r'[\s_-]+')
+
+# Blocker risk keywords, matched as substrings of the lowercased description
+_HIGH_RISK_KEYWORDS = frozenset({"critical", "failure", "crash", "data loss"})
+_MEDIUM_RISK_KEYWORDS = frozenset({"error", "broken", "not working"})
+
+# Blocker description keyword -> related system
+_RELATED_SYSTEM_KEYWORDS = (
+    ("template", "Template Engine"),
+    ("progress", "Progress Tracking"),
+    ("config", "Configuration System"),
+)
+
+# Root cause rules, first rule with a matching keyword wins
+_ROOT_CAUSE_RULES = (
+    (frozenset({"file", "import"}), "Likely file system or dependency issue"),
+    (frozenset({"config"}), "Configuration or setup problem"),
+    (frozenset({"test"}), "Testing or validation issue"),
+)
+
+# Every blocker keyword in one pattern; the lookahead reports overlapping hits
+# in a single scan. No keyword may be a prefix of another, since only the
+# first alternative that matches at a position is reported.
+_BLOCKER_KEYWORDS = (
+    _HIGH_RISK_KEYWORDS | _MEDIUM_RISK_KEYWORDS
+    | {keyword for keyword, _ in _RELATED_SYSTEM_KEYWORDS}
+    | {keyword for keywords, _ in _ROOT_CAUSE_RULES for keyword in keywords}
+)
+_BLOCKER_KEYWORD_PATTERN = re.compile(
+    '(?=(' + '|'.join(map(re.escape, sorted(_BLOCKER_KEYWORDS, key=len, reverse=True))) + '))'
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _match_keywords(description: str) -> frozenset:
+    """Return the blocker keywords that occur in a description, in one pass."""
+    return frozenset(_BLOCKER_KEYWORD_PATTERN.findall(description.lower()))
+
+
+# State fields rewritten by every checkpoint; left out of stored snapshots so
+# that unchanged work state hashes to the same snapshot file
+_SNAPSHOT_VOLATILE_FIELDS = {
+    "metadata": frozenset({"last_updated", "checkpoint_counter"}),
+    "recovery": frozenset({"last_known_good_state", "recovery_instructions"}),
+}
+
+
+def _snapshot_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Shallow copy of a state without its per-checkpoint bookkeeping fields."""
+    snapshot = dict(state)
+    for section, fields in _SNAPSHOT_VOLATILE_FIELDS.items():
+        if isinstance(snapshot.get(section), dict):
+            snapshot[section] = {k: v for k, v in snapshot[section].items() if k not in fields}
+    return snapshot
+
+
+def _now_iso() -> str:
+    """Current UTC time in datetime.isoformat() form, without building a datetime."""
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds)) + f'.{nanos // 1000:06d}+00:00'
 
 
 class ProgressManager:
@@ -32,31 +99,54 @@ class ProgressManager:
         self.checkpoints_dir.mkdir(exist_ok=True)
         self.snapshots_dir.mkdir(exist_ok=True)
 
+        self.checkpoint_store = CheckpointStore(self.checkpoints_dir)
+
+        # Flat task/subtask ID -> task data index over the last loaded state
+        self._task_index: Dict[str, Dict[str, Any]] = {}
+        self._indexed_state: Optional[Dict[str, Any]] = None
+
+        # Next actions by (status, name), valid for the currently indexed state
+        self._next_actions_cache: Dict[tuple, List[str]] = {}
+
     def load_progress_state(self) -> Dict[str, Any]:
         """Load current progress state from JSON file."""
         try:
             if not self.state_file.exists():
-                return self._create_default_state()
+                return self._index_tasks(self._create_default_state())
 
-            with open(self.state_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(self.state_file, 'rb') as f:
+                return self._index_tasks(json_utils.loads(f.read()))
         except (json.JSONDecodeError, FileNotFoundError) as e:
             print(f"⚠️ Error loading progress state: {e}")
-            return self._create_default_state()
+            return self._index_tasks(self._create_default_state())
 
     def save_progress_state(self, state: Dict[str, Any]) -> bool:
         """Save progress state to JSON file."""
         try:
             # Update metadata
-            state["metadata"]["last_updated"] = datetime.now(timezone.utc).isoformat()
+            state["metadata"]["last_updated"] = _now_iso()
 
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(state, f, indent=2, ensure_ascii=False)
+            json_utils.write_atomic(self.state_file, json_utils.dumps(state, indent=True))
+            self._index_tasks(state)
             return True
         except Exception as e:
             print(f"❌ Error saving progress state: {e}")
             return False
 
+    def _index_tasks(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the task ID index for a state and return the state unchanged."""
+        index: Dict[str, Dict[str, Any]] = {}
+        for phase_data in state.get("phases", {}).values():
+            for task_key, task_data in phase_data.get("tasks", {}).items():
+                index.setdefault(task_key, task_data)
+                for subtask_key, subtask_data in task_data.get("subtasks", {}).items():
+                    index.setdefault(subtask_key, subtask_data)
+
+        self._task_index = index
+        self._indexed_state = state
+        self._next_actions_cache.clear()
+        return state
+
     def resume_progress(self, task_id: Optional[str] = None) -> Dict[str, Any]:
         """Implement /resume_progress command."""
         state = self.load_progress_state()
@@ -133,18 +223,23 @@ class ProgressManager:
     def progress_status(self) -> Dict[str, Any]:
         """Implement /progress_status command."""
         state = self.load_progress_state()
+        metadata = state["metadata"]
         current_session = state.get("current_session", {})
+        phase_num = metadata.get("current_phase", 1)
+        active_task = current_session.get("active_task", "UNKNOWN")
+        task_details = self._find_task_details(state, active_task)
+        active_blockers = self._get_active_blockers(state)
 
         return {
             "command": "/progress_status",
             "status": "SUCCESS",
-            "current_phase": f"Phase {state['metadata'].get('current_phase', 1)} - {self._get_phase_name(state, state['metadata'].get('current_phase', 1))}",
-            "phase_progress": f"{state['metadata'].get('overall_progress', 0)}% complete",
-            "active_task": f"{current_session.get('active_task', 'UNKNOWN')} - {self._get_task_name(state, current_session.get('active_task', ''))}",
-            "task_progress": f"{self._get_task_progress(state, current_session.get('active_task', ''))}% complete",
+            "current_phase": f"Phase {phase_num} - {self._get_phase_name(state, phase_num)}",
+            "phase_progress": f"{metadata.get('overall_progress', 0)}% complete",
+            "active_task": f"{active_task} - {task_details.get('name', 'Unknown Task')}",
+            "task_progress": f"{task_details.get('progress_percentage', 0)}% complete",
             "session_progress": f"{self._calculate_session_hours(current_session)} hours, {self._count_session_tasks(state)} tasks advanced",
             "next": current_session.get("next_planned_action", "No next action defined"),
-            "blockers": "none" if not self._get_active_blockers(state) else str(len(self._get_active_blockers(state))) + " active",
+            "blockers": f"{len(active_blockers)} active" if active_blockers else "none",
             "continue_prompt": "Continue current work? Y/N"
         }
 
@@ -152,14 +247,20 @@ class ProgressManager:
         """Implement /checkpoint_save command."""
         state = self.load_progress_state()
 
-        # Generate checkpoint ID
-        checkpoint_count = len(state.get("checkpoints", [])) + 1
+        # Generate checkpoint ID, continuing from the legacy in-state list if
+        # present; a recovered state may carry an older counter, so never go
+        # below the highest ID already stored
+        metadata = state["metadata"]
+        checkpoint_count = max(
+            metadata.get("checkpoint_counter", len(state.get("checkpoints", []))),
+            self.checkpoint_store.highest_number("CP")
+        ) + 1
         checkpoint_id = f"CP{checkpoint_count:03d}"
 
         # Create checkpoint data
         checkpoint = {
             "checkpoint_id": checkpoint_id,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": _now_iso(),
             "description": description,
             "phase": state["metadata"].get("current_phase", 1),
             "task": state["current_session"].get("active_task", "UNKNOWN"),
@@ -169,27 +270,21 @@ class ProgressManager:
             "next_actions": self._generate_next_actions(state, self._find_task_details(state, state["current_session"].get("active_task", "")))
         }
 
-        # Save checkpoint to file
-        checkpoint_file = self.checkpoints_dir / f"{checkpoint_id}_{datetime.now().strftime('%Y%m%d_%H%M')}_{self._slugify(description)}.json"
-
         try:
-            with open(checkpoint_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "checkpoint": checkpoint,
-                    "full_state": state
-                }, f, indent=2, ensure_ascii=False)
-
-            # Add to checkpoints list in state
-            if "checkpoints" not in state:
-                state["checkpoints"] = []
-            state["checkpoints"].append(checkpoint)
-
-            # Update recovery info
+            # Apply every state change in memory first; checkpoint records
+            # live in the checkpoint store, not in the state itself
+            metadata["checkpoint_counter"] = checkpoint_count
+            state.pop("checkpoints", None)
+
             state["recovery"]["last_known_good_state"] = checkpoint_id
             state["recovery"]["recovery_instructions"] = f"Load checkpoint {checkpoint_id} and resume from {checkpoint['task']}"
+            state["metadata"]["last_updated"] = checkpoint["timestamp"]
 
-            # Save updated state
-            self.save_progress_state(state)
+            # Then commit the checkpoint record and the updated state together;
+            # the snapshot omits bookkeeping so unchanged work state is shared
+            snapshot_data = json_utils.dumps(_snapshot_state(state), indent=True)
+            self.checkpoint_store.append({"checkpoint": checkpoint}, snapshot_data)
+            json_utils.write_atomic(self.state_file, json_utils.dumps(state, indent=True))
 
             return {
                 "command": f"/checkpoint_save \"{description}\"",
@@ -242,21 +337,23 @@ class ProgressManager:
 
     def _create_default_state(self) -> Dict[str, Any]:
         """Create default progress state structure."""
+        now = _now_iso()
         return {
             "metadata": {
                 "version": "1.0",
-                "created": datetime.now(timezone.utc).isoformat(),
-                "last_updated": datetime.now(timezone.utc).isoformat(),
+                "created": now,
+                "last_updated": now,
                 "updated_by": "ProgressManager",
                 "project_name": "ClaudeCode Enhancement",
                 "total_phases": 5,
                 "current_phase": 1,
-                "overall_progress": 0.0
+                "overall_progress": 0.0,
+                "checkpoint_counter": 0
             },
             "current_session": {
-                "session_id": f"session_{datetime.now().strftime('%Y%m%d_%H%M')}",
-                "started": datetime.now(timezone.utc).isoformat(),
-                "last_activity": datetime.now(timezone.utc).isoformat(),
+                "session_id": f"session_{time.strftime('%Y%m%d_%H%M')}",
+                "started": now,
+                "last_activity": now,
                 "active_task": "P1.1.1",
                 "context_summary": "Project initialization",
                 "next_planned_action": "Begin project setup",
@@ -276,7 +373,6 @@ class ProgressManager:
                 "current_velocity": 0.0,
                 "projected_completion": "TBD"
             },
-            "checkpoints": [],
             "recovery": {
                 "last_known_good_state": None,
                 "rollback_available": False,
@@ -288,21 +384,10 @@ class ProgressManager:
 
     def _find_task_details(self, state: Dict[str, Any], task_id: str) -> Dict[str, Any]:
         """Find task details by ID in the state structure."""
-        phases = state.get("phases", {})
-
-        for phase_id, phase_data in phases.items():
-            tasks = phase_data.get("tasks", {})
-            for task_key, task_data in tasks.items():
-                if task_key == task_id:
-                    return task_data
+        if state is not self._indexed_state:
+            self._index_tasks(state)
 
-                # Check subtasks
-                subtasks = task_data.get("subtasks", {})
-                for subtask_key, subtask_data in subtasks.items():
-                    if subtask_key == task_id:
-                        return subtask_data
-
-        return {}
+        return self._task_index.get(task_id, {})
 
     def _get_phase_name(self, state: Dict[str, Any], phase_num: int) -> str:
         """Get phase name by number."""
@@ -327,20 +412,26 @@ class ProgressManager:
             return ["Review current task status", "Update progress state", "Continue with planned work"]
 
         status = task_details.get("status", "UNKNOWN")
-        if status == "IN_PROGRESS":
-            return [
-                f"Continue working on {task_details.get('name', 'current task')}",
-                "Update progress as work proceeds",
-                "Create checkpoint after significant progress"
-            ]
-        elif status == "PENDING":
-            return [
-                f"Begin work on {task_details.get('name', 'planned task')}",
-                "Review acceptance criteria",
-                "Create initial checkpoint"
-            ]
-        else:
-            return ["Review task status", "Determine next steps", "Update progress state"]
+        key = (status, task_details.get("name"))
+        next_actions = self._next_actions_cache.get(key)
+        if next_actions is None:
+            if status == "IN_PROGRESS":
+                next_actions = [
+                    f"Continue working on {task_details.get('name', 'current task')}",
+                    "Update progress as work proceeds",
+                    "Create checkpoint after significant progress"
+                ]
+            elif status == "PENDING":
+                next_actions = [
+                    f"Begin work on {task_details.get('name', 'planned task')}",
+                    "Review acceptance criteria",
+                    "Create initial checkpoint"
+                ]
+            else:
+                next_actions = ["Review task status", "Determine next steps", "Update progress state"]
+            self._next_actions_cache[key] = next_actions
+
+        return list(next_actions)
 
     def _get_active_blockers(self, state: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Get list of active blockers."""
@@ -348,42 +439,30 @@ class ProgressManager:
 
     def _slugify(self, text: str) -> str:
         """Convert text to URL-friendly slug."""
-        import re
-        text = re.sub(r'[^\w\s-]', '', text).strip().lower()
-        return re.sub(r'[\s_-]+', '-', text)[:50]
+        text = _SLUG_STRIP.sub('', text).strip().lower()
+        return _SLUG_DASH.sub('-', text)[:50]
 
     # Additional helper methods for blocker analysis
     def _analyze_root_cause(self, description: str, task_details: Dict[str, Any]) -> str:
         """Analyze potential root cause of blocker."""
-        if "file" in description.lower() or "import" in description.lower():
-            return "Likely file system or dependency issue"
-        elif "config" in description.lower():
-            return "Configuration or setup problem"
-        elif "test" in description.lower():
-            return "Testing or validation issue"
-        else:
-            return "Requires detailed analysis of the specific problem"
+        hits = _match_keywords(description)
+        for keywords, root_cause in _ROOT_CAUSE_RULES:
+            if hits & keywords:
+                return root_cause
+        return "Requires detailed analysis of the specific problem"
 
     def _identify_related_systems(self, description: str, state: Dict[str, Any]) -> List[str]:
         """Identify systems related to the blocker."""
-        systems = []
-        if "template" in description.lower():
-            systems.append("Template Engine")
-        if "progress" in description.lower():
-            systems.append("Progress Tracking")
-        if "config" in description.lower():
-            systems.append("Configuration System")
+        hits = _match_keywords(description)
+        systems = [system for keyword, system in _RELATED_SYSTEM_KEYWORDS if keyword in hits]
         return systems if systems else ["Unknown System"]
 
     def _assess_risk_level(self, description: str) -> str:
         """Assess risk level of the blocker."""
-        high_risk_keywords = ["critical", "failure", "crash", "data loss"]
-        medium_risk_keywords = ["error", "broken", "not working"]
-
-        desc_lower = description.lower()
-        if any(keyword in desc_lower for keyword in high_risk_keywords):
+        hits = _match_keywords(description)
+        if hits & _HIGH_RISK_KEYWORDS:
             return "HIGH"
-        elif any(keyword in desc_lower for keyword in medium_risk_keywords):
+        elif hits & _MEDIUM_RISK_KEYWORDS:
             return "MEDIUM"
         else:
             return "LOW"
@@ -422,16 +501,6 @@ class ProgressManager:
         """Get immediate next step for task."""
         return task_details.get("next_step", "Continue with task implementation")
 
-    def _get_task_name(self, state: Dict[str, Any], task_id: str) -> str:
-        """Get task name by ID."""
-        task_details = self._find_task_details(state, task_id)
-        return task_details.get("name", "Unknown Task")
-
-    def _get_task_progress(self, state: Dict[str, Any], task_id: str) -> int:
-        """Get task progress percentage by ID."""
-        task_details = self._find_task_details(state, task_id)
-        return task_details.get("progress_percentage", 0)
-
     def _calculate_session_hours(self, session: Dict[str, Any]) -> float:
         """Calculate hours spent in current session."""
         # This would calculate actual time - for now return placeholder
@@ -443,132 +512,146 @@ class ProgressManager:
         return 1
 
 
+# Command name -> handler taking the manager and the optional command argument
+COMMANDS = {
+    "resume_progress": lambda manager, arg: manager.resume_progress(arg),
+    "progress_status": lambda manager, arg: manager.progress_status(),
+    "checkpoint_save": lambda manager, arg: manager.checkpoint_save(
+        arg if arg is not None else "Manual checkpoint"),
+    "analyze_blocker": lambda manager, arg: manager.analyze_blocker(
+        arg if arg is not None else "Unspecified blocker"),
+}
+
+
 def main():
     """Main entry point for the progress resume script."""
-    if len(sys.argv) < 2:
-        print("Usage: python resume_progress.py <command> [args...]")
-        print("Commands: resume_progress, progress_status, checkpoint_save, analyze_blocker")
-        sys.exit(1)
-
-    command = sys.argv[1]
+    parser = argparse.ArgumentParser(
+        description="ClaudeCode progress continuity commands"
+    )
+    parser.add_argument("command",
+                       help=f"Command to run ({', '.join(COMMANDS)})")
+    parser.add_argument("argument", nargs="?",
+                       help="Task ID for resume_progress, description for checkpoint_save and analyze_blocker")
+    parser.add_argument("--json", action="store_true",
+                       help="Print the raw result as JSON")
+
+    args = parser.parse_args()
+    command = args.command
     manager = ProgressManager()
 
     try:
-        if command == "resume_progress":
-            task_id = sys.argv[2] if len(sys.argv) > 2 else None
-            result = manager.resume_progress(task_id)
-        elif command == "progress_status":
-            result = manager.progress_status()
-        elif command == "checkpoint_save":
-            description = sys.argv[2] if len(sys.argv) > 2 else "Manual checkpoint"
-            result = manager.checkpoint_save(description)
-        elif command == "analyze_blocker":
-            description = sys.argv[2] if len(sys.argv) > 2 else "Unspecified blocker"
-            result = manager.analyze_blocker(description)
-        else:
+        handler = COMMANDS.get(command)
+        if handler is None:
             result = {"status": "ERROR", "message": f"Unknown command: {command}"}
+        else:
+            result = handler(manager, args.argument)
+
+        if args.json:
+            sys.stdout.buffer.write(json_utils.dumps(result, indent=True) + b"\n")
+            return
 
-        # Pretty print the result
-        print("⚡️ CLAUDECODE PROGRESS SYSTEM")
-        print("=" * 50)
+        # Pretty print the result, collected and written in one go
+        out = ["⚡️ CLAUDECODE PROGRESS SYSTEM", "=" * 50]
 
         if result.get("status") == "SUCCESS":
             if command == "resume_progress":
                 if "project_status" in result:
-                    print(f"\n📊 PROJECT STATUS:")
+                    out.append(f"\n📊 PROJECT STATUS:")
                     ps = result["project_status"]
-                    print(f"- Phase: {ps['phase']} - {ps['phase_name']}")
-                    print(f"- Task: {ps['task']} - {ps['task_name']}")
-                    print(f"- Progress: {ps['progress']}% complete")
-                    print(f"- Status: {ps['status_indicator']}")
+                    out.append(f"- Phase: {ps['phase']} - {ps['phase_name']}")
+                    out.append(f"- Task: {ps['task']} - {ps['task_name']}")
+                    out.append(f"- Progress: {ps['progress']}% complete")
+                    out.append(f"- Status: {ps['status_indicator']}")
 
-                    print(f"\n🎯 CURRENT CONTEXT:")
-                    print(f"{result['current_context']}")
+                    out.append(f"\n🎯 CURRENT CONTEXT:")
+                    out.append(f"{result['current_context']}")
 
-                    print(f"\n📁 FILES IN SCOPE:")
+                    out.append(f"\n📁 FILES IN SCOPE:")
                     files = result["files_in_scope"]
                     if files["modified"]:
-                        print(f"- Modified: {', '.join(files['modified'])}")
+                        out.append(f"- Modified: {', '.join(files['modified'])}")
                     if files["pending"]:
-                        print(f"- Pending: {', '.join(files['pending'])}")
+                        out.append(f"- Pending: {', '.join(files['pending'])}")
 
-                    print(f"\n🚦 NEXT ACTIONS:")
+                    out.append(f"\n🚦 NEXT ACTIONS:")
                     for i, action in enumerate(result["next_actions"], 1):
-                        print(f"{i}. {action}")
+                        out.append(f"{i}. {action}")
 
-                    print(f"\n⏱️ ESTIMATED TIME: {result['estimated_time']}")
-                    print(f"🚨 BLOCKERS: {result['blockers'] if result['blockers'] else 'None'}")
-                    print(f"\n{result['ready_message']}")
+                    out.append(f"\n⏱️ ESTIMATED TIME: {result['estimated_time']}")
+                    out.append(f"🚨 BLOCKERS: {result['blockers'] if result['blockers'] else 'None'}")
+                    out.append(f"\n{result['ready_message']}")
 
                 elif "task_details" in result:
-                    print(f"\n📋 TASK DETAILS:")
+                    out.append(f"\n📋 TASK DETAILS:")
                     td = result["task_details"]
-                    print(f"- Name: {td['name']}")
-                    print(f"- Status: {td['status']}")
-                    print(f"- Progress: {td['progress']}%")
-                    print(f"- Dependencies: {', '.join(td['dependencies']) if td['dependencies'] else 'None'}")
+                    out.append(f"- Name: {td['name']}")
+                    out.append(f"- Status: {td['status']}")
+                    out.append(f"- Progress: {td['progress']}%")
+                    out.append(f"- Dependencies: {', '.join(td['dependencies']) if td['dependencies'] else 'None'}")
 
-                    print(f"\n🎯 OBJECTIVE:")
-                    print(f"{result['objective']}")
+                    out.append(f"\n🎯 OBJECTIVE:")
+                    out.append(f"{result['objective']}")
 
-                    print(f"\n🚦 IMMEDIATE NEXT STEP:")
-                    print(f"{result['immediate_next_step']}")
+                    out.append(f"\n🚦 IMMEDIATE NEXT STEP:")
+                    out.append(f"{result['immediate_next_step']}")
 
-                    print(f"\n{result['ready_message']}")
+                    out.append(f"\n{result['ready_message']}")
 
             elif command == "progress_status":
-                print(f"\n📊 QUICK STATUS UPDATE")
-                print(f"Current: {result['current_phase']} ({result['phase_progress']})")
-                print(f"Active Task: {result['active_task']} ({result['task_progress']})")
-                print(f"Session Progress: {result['session_progress']}")
-                print(f"Next: {result['next']}")
-                print(f"Blockers: {result['blockers']}")
-                print(f"\n{result['continue_prompt']}")
+                out.append(f"\n📊 QUICK STATUS UPDATE")
+                out.append(f"Current: {result['current_phase']} ({result['phase_progress']})")
+                out.append(f"Active Task: {result['active_task']} ({result['task_progress']})")
+                out.append(f"Session Progress: {result['session_progress']}")
+                out.append(f"Next: {result['next']}")
+                out.append(f"Blockers: {result['blockers']}")
+                out.append(f"\n{result['continue_prompt']}")
 
             elif command == "checkpoint_save":
-                print(f"\n💾 CHECKPOINT CREATED")
-                print(f"Checkpoint ID: {result['checkpoint_id']}")
-                print(f"Timestamp: {result['timestamp']}")
-                print(f"Description: {result['description']}")
+                out.append(f"\n💾 CHECKPOINT CREATED")
+                out.append(f"Checkpoint ID: {result['checkpoint_id']}")
+                out.append(f"Timestamp: {result['timestamp']}")
+                out.append(f"Description: {result['description']}")
 
-                print(f"\n📊 STATE CAPTURED:")
+                out.append(f"\n📊 STATE CAPTURED:")
                 sc = result["state_captured"]
-                print(f"- Phase: {sc['phase']}")
-                print(f"- Task: {sc['task']}")
-                print(f"- Files: {sc['files']}")
-                print(f"- Context: {sc['context']}")
+                out.append(f"- Phase: {sc['phase']}")
+                out.append(f"- Task: {sc['task']}")
+                out.append(f"- Files: {sc['files']}")
+                out.append(f"- Context: {sc['context']}")
 
-                print(f"\n✅ CHECKPOINT SUCCESSFUL")
-                print(f"Recovery command: {result['recovery_command']}")
-                print(f"\n{result['continue_prompt']}")
+                out.append(f"\n✅ CHECKPOINT SUCCESSFUL")
+                out.append(f"Recovery command: {result['recovery_command']}")
+                out.append(f"\n{result['continue_prompt']}")
 
             elif command == "analyze_blocker":
-                print(f"\n🔍 BLOCKER ANALYSIS")
-                print(f"Problem: {result['problem']}")
+                out.append(f"\n🔍 BLOCKER ANALYSIS")
+                out.append(f"Problem: {result['problem']}")
 
-                print(f"\n🧠 ANALYSIS:")
+                out.append(f"\n🧠 ANALYSIS:")
                 analysis = result["analysis"]
-                print(f"- Root Cause Assessment: {analysis['root_cause_assessment']}")
-                print(f"- Related Systems: {', '.join(analysis['related_systems'])}")
-                print(f"- Risk Level: {analysis['risk_level']}")
+                out.append(f"- Root Cause Assessment: {analysis['root_cause_assessment']}")
+                out.append(f"- Related Systems: {', '.join(analysis['related_systems'])}")
+                out.append(f"- Risk Level: {analysis['risk_level']}")
 
-                print(f"\n💡 POTENTIAL SOLUTIONS:")
+                out.append(f"\n💡 POTENTIAL SOLUTIONS:")
                 for i, solution in enumerate(result["potential_solutions"], 1):
-                    print(f"{i}. {solution}")
+                    out.append(f"{i}. {solution}")
 
-                print(f"\n🎯 RECOMMENDED APPROACH:")
-                print(f"{result['recommended_approach']}")
+                out.append(f"\n🎯 RECOMMENDED APPROACH:")
+                out.append(f"{result['recommended_approach']}")
 
-                print(f"\n📋 ACTION PLAN:")
+                out.append(f"\n📋 ACTION PLAN:")
                 for i, step in enumerate(result["action_plan"], 1):
-                    print(f"{i}. {step}")
+                    out.append(f"{i}. {step}")
 
-                print(f"\n{result['continue_prompt']}")
+                out.append(f"\n{result['continue_prompt']}")
 
         else:
-            print(f"❌ ERROR: {result.get('message', 'Unknown error')}")
+            out.append(f"❌ ERROR: {result.get('message', 'Unknown error')}")
             if "suggestion" in result:
-                print(f"💡 Suggestion: {result['suggestion']}")
+                out.append(f"💡 Suggestion: {result['suggestion']}")
+
+        sys.stdout.write("\n".join(out) + "\n")
 
     except Exception as e:
         print(f"❌ SYSTEM ERROR: {e}")
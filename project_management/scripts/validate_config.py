@@ -11,6 +11,7 @@ Usage:
     python validate_config.py --fix-auto
     python validate_config.py --detailed
     python validate_config.py --export-report validation_report.json
+    python validate_config.py --no-cache
 
 Features:
     - Cross-reference validation between config.yaml and actual files
@@ -19,27 +20,67 @@ Features:
     - Priority conflict detection
     - Circular dependency detection
     - Auto-fix capabilities for common issues
+    - Cached results for unchanged configurations
 """
 
 import argparse
-import json
+import errno
+import hashlib
+import mmap
 import os
 import re
+import stat
 import sys
+import time
 import yaml
 from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple, Union
 
+import json_utils
+
+# Use the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Dependency declarations in component files, e.g. "depends_on: a, b"
+_DEPENDS_RE = re.compile(rb'depends_on:\s*(.+)')
+
+# Component files at least this large are scanned through mmap; mapping costs
+# more than a plain read for small files
+_MMAP_THRESHOLD = 4096
+
+# Per-file checks run serially on local disks, where a thread pool only adds
+# overhead. The first _IO_PROBE_COUNT files are timed; if they average more
+# than _SLOW_IO_SECONDS each (e.g. a network filesystem), the rest fan out
+# to up to _IO_WORKERS threads
+_IO_PROBE_COUNT = 8
+_SLOW_IO_SECONDS = 0.002
+_IO_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Bump when validation rules change so stale cached results are ignored
+_RESULT_CACHE_VERSION = b"5"
+_RESULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "claudecode"
+
+# Console icon for each error severity
+_ICONS = {'critical': '❌', 'error': '🔴', 'warning': '⚠️', 'info': 'ℹ️'}
+
 
 class ValidationError:
     """Represents a validation error with severity and context."""
 
+    # Many instances are created per run; slots avoid a __dict__ for each
+    __slots__ = ('severity', 'category', 'message', 'file_path', 'fix_suggestion', 'timestamp')
+
     def __init__(self, severity: str, category: str, message: str,
                  file_path: Optional[str] = None, fix_suggestion: Optional[str] = None):
-        self.severity = severity  # 'critical', 'error', 'warning', 'info'
-        self.category = category
+        # Few distinct values across many errors; share one string object each
+        self.severity = sys.intern(severity)  # 'critical', 'error', 'warning', 'info'
+        self.category = sys.intern(category)
         self.message = message
         self.file_path = file_path
         self.fix_suggestion = fix_suggestion
@@ -59,14 +100,53 @@ class ValidationError:
 class ConfigValidator:
     """Main configuration validation class."""
 
+    REQUIRED_DIRS = [
+        "agent-config",
+        "agent-config/persona",
+        "agent-config/prompts",
+        "agent-config/guardrails",
+        "agent-config/behaviors",
+        "agent-config/workflows",
+        "agent-config/templates"
+    ]
+
+    OPTIONAL_DIRS = [
+        "features",
+        "logs",
+        "tasks",
+        "scripts",
+        "agent-config/command_templates",
+        "agent-config/prd"
+    ]
+
+    # Config sections that contain file references
+    FILE_SECTIONS = [
+        'persona', 'prompts', 'guardrails', 'behaviors',
+        'workflows', 'templates', 'command_templates', 'prd'
+    ]
+
     def __init__(self, claude_code_root: Path):
         self.root = claude_code_root
         self.config_file = self.root / "config.yaml"
         self.agent_config_dir = self.root / "agent-config"
         self.errors: List[ValidationError] = []
         self.config_data: Optional[Dict] = None
-        self.file_references: Dict[str, Set[str]] = defaultdict(set)
+        self.file_references: Dict[str, Set[Path]] = defaultdict(set)
+        # Referenced files that passed _check_file_reference
+        self._valid_references: Set[Path] = set()
         self.priority_map: Dict[str, int] = {}
+        # Frontmatter items grouped by (category, priority)
+        self._prio_index: Dict[Tuple[str, int], List[Dict]] = defaultdict(list)
+        # path -> (mtime_ns, size, scan result from _scan_component_file)
+        self._component_cache: Dict[str, Tuple[int, int, Dict]] = {}
+        # Config parsed while computing the result cache key, reused by _load_config
+        self._preloaded_config: Optional[Dict] = None
+        # Set when per-file I/O was timed as slow enough to use threads
+        self._slow_io = False
+        # Key of the current inputs, checked against the stored result cache
+        self._result_cache_key: Optional[str] = None
+        # Component names ordered so each comes after everything it depends on
+        self.topo_order: List[str] = []
 
     def validate_all(self) -> bool:
         """Run comprehensive validation of all components."""
@@ -75,10 +155,7 @@ class ConfigValidator:
         success = True
 
         # Core validation steps
-        if not self._validate_config_file_exists():
-            return False
-
-        if not self._load_and_validate_config_syntax():
+        if not self._load_config():
             return False
 
         if not self._validate_directory_structure():
@@ -100,65 +177,59 @@ class ConfigValidator:
 
         return success and not self._has_critical_errors()
 
-    def _validate_config_file_exists(self) -> bool:
-        """Check if main config file exists and is readable."""
-        if not self.config_file.exists():
-            self.errors.append(ValidationError(
-                'critical', 'file_missing',
-                f"Main configuration file not found: {self.config_file}",
-                fix_suggestion="Create config.yaml in the ClaudeCode root directory"
-            ))
-            return False
-
-        if not self.config_file.is_file():
-            self.errors.append(ValidationError(
-                'critical', 'file_type',
-                f"Configuration path is not a file: {self.config_file}"
-            ))
-            return False
-
-        try:
-            with open(self.config_file, 'r') as f:
-                f.read()
-        except PermissionError:
-            self.errors.append(ValidationError(
-                'critical', 'file_permissions',
-                f"Cannot read configuration file due to permissions: {self.config_file}"
-            ))
-            return False
-        except Exception as e:
-            self.errors.append(ValidationError(
-                'critical', 'file_access',
-                f"Cannot access configuration file: {str(e)}"
-            ))
-            return False
-
-        return True
-
-    def _load_and_validate_config_syntax(self) -> bool:
-        """Load and validate YAML syntax of config file."""
-        try:
-            with open(self.config_file, 'r') as f:
-                self.config_data = yaml.safe_load(f)
+    def _load_config(self) -> bool:
+        """Read the main config file once and validate its YAML syntax."""
+        if self._preloaded_config is not None:
+            self.config_data = self._preloaded_config
+        else:
+            try:
+                data = self.config_file.read_bytes()
+            except FileNotFoundError:
+                self.errors.append(ValidationError(
+                    'critical', 'file_missing',
+                    f"Main configuration file not found: {self.config_file}",
+                    fix_suggestion="Create config.yaml in the ClaudeCode root directory"
+                ))
+                return False
+            except IsADirectoryError:
+                self.errors.append(ValidationError(
+                    'critical', 'file_type',
+                    f"Configuration path is not a file: {self.config_file}"
+                ))
+                return False
+            except PermissionError:
+                self.errors.append(ValidationError(
+                    'critical', 'file_permissions',
+                    f"Cannot read configuration file due to permissions: {self.config_file}"
+                ))
+                return False
+            except OSError as e:
+                self.errors.append(ValidationError(
+                    'critical', 'file_access',
+                    f"Cannot access configuration file: {str(e)}"
+                ))
+                return False
 
-            if not isinstance(self.config_data, dict):
+            try:
+                self.config_data = yaml.load(data, Loader=_YamlLoader)
+            except yaml.YAMLError as e:
+                self.errors.append(ValidationError(
+                    'critical', 'yaml_syntax',
+                    f"YAML syntax error in config file: {str(e)}",
+                    fix_suggestion="Fix YAML syntax errors using a YAML validator"
+                ))
+                return False
+            except Exception as e:
                 self.errors.append(ValidationError(
-                    'critical', 'config_format',
-                    "Configuration file must contain a YAML dictionary at root level"
+                    'critical', 'config_load',
+                    f"Failed to load configuration: {str(e)}"
                 ))
                 return False
 
-        except yaml.YAMLError as e:
+        if not isinstance(self.config_data, dict):
             self.errors.append(ValidationError(
-                'critical', 'yaml_syntax',
-                f"YAML syntax error in config file: {str(e)}",
-                fix_suggestion="Fix YAML syntax errors using a YAML validator"
-            ))
-            return False
-        except Exception as e:
-            self.errors.append(ValidationError(
-                'critical', 'config_load',
-                f"Failed to load configuration: {str(e)}"
+                'critical', 'config_format',
+                "Configuration file must contain a YAML dictionary at root level"
             ))
             return False
 
@@ -167,46 +238,28 @@ class ConfigValidator:
 
     def _validate_directory_structure(self) -> bool:
         """Validate expected directory structure exists."""
-        required_dirs = [
-            "agent-config",
-            "agent-config/persona",
-            "agent-config/prompts",
-            "agent-config/guardrails",
-            "agent-config/behaviors",
-            "agent-config/workflows",
-            "agent-config/templates"
-        ]
-
-        optional_dirs = [
-            "features",
-            "logs",
-            "tasks",
-            "scripts",
-            "agent-config/command_templates",
-            "agent-config/prd"
-        ]
-
         success = True
+        kinds = self._dir_kinds(self.REQUIRED_DIRS + self.OPTIONAL_DIRS)
 
-        for dir_path in required_dirs:
+        for dir_path in self.REQUIRED_DIRS:
             full_path = self.root / dir_path
-            if not full_path.exists():
+            if kinds[dir_path] is None:
                 self.errors.append(ValidationError(
                     'error', 'missing_directory',
                     f"Required directory missing: {dir_path}",
                     fix_suggestion=f"Create directory: mkdir -p {full_path}"
                 ))
                 success = False
-            elif not full_path.is_dir():
+            elif not kinds[dir_path]:
                 self.errors.append(ValidationError(
                     'error', 'not_directory',
                     f"Path exists but is not a directory: {dir_path}"
                 ))
                 success = False
 
-        for dir_path in optional_dirs:
+        for dir_path in self.OPTIONAL_DIRS:
             full_path = self.root / dir_path
-            if not full_path.exists():
+            if kinds[dir_path] is None:
                 self.errors.append(ValidationError(
                     'info', 'optional_directory',
                     f"Optional directory not found: {dir_path}",
@@ -218,6 +271,33 @@ class ConfigValidator:
 
         return success
 
+    def _dir_kinds(self, dir_paths: List[str]) -> Dict[str, Optional[bool]]:
+        """Map each relative path to whether it is a directory, or None if missing.
+
+        Each distinct parent is listed once with os.scandir instead of
+        stat-ing every path separately.
+        """
+        listings: Dict[str, Dict[str, os.DirEntry]] = {}
+        kinds: Dict[str, Optional[bool]] = {}
+
+        for dir_path in dir_paths:
+            parent, _, name = dir_path.rpartition('/')
+            if parent not in listings:
+                try:
+                    with os.scandir(self.root / parent) as it:
+                        listings[parent] = {entry.name: entry for entry in it}
+                except OSError:
+                    listings[parent] = {}
+
+            entry = listings[parent].get(name)
+            # Only symlinks need a stat: a dangling link counts as missing
+            if entry is None or (entry.is_symlink() and not os.path.exists(entry.path)):
+                kinds[dir_path] = None
+            else:
+                kinds[dir_path] = entry.is_dir()
+
+        return kinds
+
     def _validate_file_references(self) -> bool:
         """Validate all file references in config exist and are accessible."""
         if not self.config_data:
@@ -225,74 +305,108 @@ class ConfigValidator:
 
         success = True
 
-        # Define sections that contain file references
-        file_sections = [
-            'persona', 'prompts', 'guardrails', 'behaviors',
-            'workflows', 'templates', 'command_templates', 'prd'
-        ]
+        references = self._collect_file_references(self.config_data)
 
-        for section in file_sections:
-            if section in self.config_data:
-                section_files = self.config_data[section]
-                if isinstance(section_files, list):
-                    for file_ref in section_files:
-                        if isinstance(file_ref, str):
-                            if not self._validate_single_file_reference(section, file_ref):
-                                success = False
+        results = self._map_io(lambda ref: self._check_file_reference(*ref), references)
+        for (section, _), (full_path, error) in zip(references, results):
+            self.file_references[section].add(full_path)
+            if error is not None:
+                self.errors.append(error)
+                success = False
+            else:
+                self._valid_references.add(full_path)
 
         if success:
             print("  ✅ File references valid")
 
         return success
 
-    def _validate_single_file_reference(self, section: str, file_ref: str) -> bool:
-        """Validate a single file reference."""
-        # Handle relative paths from agent-config directory
+    def _collect_file_references(self, config_data: Dict) -> List[Tuple[str, str]]:
+        """List (section, file reference) pairs from the config's file sections."""
+        references = []
+        for section in self.FILE_SECTIONS:
+            if section in config_data:
+                section_files = config_data[section]
+                if isinstance(section_files, list):
+                    for file_ref in section_files:
+                        if isinstance(file_ref, str):
+                            references.append((section, file_ref))
+        return references
+
+    def _resolve_reference(self, file_ref: str) -> Path:
+        """Resolve a file reference, relative ones from the agent-config directory."""
         if not file_ref.startswith('/'):
-            full_path = self.agent_config_dir / file_ref
-        else:
-            full_path = Path(file_ref)
+            return self.agent_config_dir / file_ref
+        return Path(file_ref)
 
-        self.file_references[section].add(str(full_path))
+    def _check_file_reference(self, section: str, file_ref: str) -> Tuple[Path, Optional[ValidationError]]:
+        """Resolve a single file reference and return (path, error or None).
 
-        if not full_path.exists():
-            self.errors.append(ValidationError(
+        Does not touch shared validator state, so _map_io may run it in a
+        worker thread.
+        """
+        full_path = self._resolve_reference(file_ref)
+
+        # One stat covers both the existence and the file type check
+        try:
+            st = full_path.stat()
+        except OSError:
+            return full_path, ValidationError(
                 'error', 'missing_file',
                 f"Referenced file not found in {section}: {file_ref}",
                 file_path=file_ref,
                 fix_suggestion=f"Create file or fix reference: {full_path}"
-            ))
-            return False
+            )
 
-        if not full_path.is_file():
-            self.errors.append(ValidationError(
+        if not stat.S_ISREG(st.st_mode):
+            return full_path, ValidationError(
                 'error', 'not_file',
                 f"Referenced path is not a file in {section}: {file_ref}",
                 file_path=file_ref
-            ))
-            return False
+            )
 
-        # Check file is readable
-        try:
-            with open(full_path, 'r') as f:
-                f.read(1)  # Try to read at least one character
-        except Exception as e:
-            self.errors.append(ValidationError(
+        # Check file is readable without opening it
+        if not os.access(full_path, os.R_OK):
+            return full_path, ValidationError(
                 'error', 'file_unreadable',
-                f"Cannot read referenced file in {section}: {file_ref} - {str(e)}",
+                f"Cannot read referenced file in {section}: {file_ref} - {os.strerror(errno.EACCES)}",
                 file_path=file_ref
-            ))
-            return False
+            )
 
-        return True
+        return full_path, None
+
+    def _map_io(self, func, items: List) -> List:
+        """Apply func to each item, returning results in order.
+
+        Runs serially unless the first few calls show slow storage, in which
+        case the remaining items run on a thread pool.
+        """
+        probe = items[:_IO_PROBE_COUNT]
+        start = time.perf_counter()
+        results = [func(item) for item in probe]
+        rest = items[len(probe):]
+
+        if rest and time.perf_counter() - start > _SLOW_IO_SECONDS * len(probe):
+            self._slow_io = True
+            with ThreadPoolExecutor(max_workers=min(_IO_WORKERS, len(rest))) as executor:
+                results.extend(executor.map(func, rest))
+        else:
+            results.extend(func(item) for item in rest)
+        return results
 
     def _validate_component_files(self) -> bool:
         """Validate individual component files for proper format."""
         success = True
 
+        # On slow storage, read all files concurrently first; the validation
+        # below then hits the component cache
+        if self._slow_io:
+            self._map_io(self._prefetch_component_file,
+                         [p for paths in self.file_references.values() for p in paths])
+
         for section, file_paths in self.file_references.items():
             for file_path in file_paths:
-                if not self._validate_component_file_format(section, Path(file_path)):
+                if not self._validate_component_file_format(section, file_path):
                     success = False
 
         if success:
@@ -300,52 +414,111 @@ class ConfigValidator:
 
         return success
 
+    def _scan_component_file(self, file_path: Path) -> Dict:
+        """Read a component file once and extract its frontmatter and dependencies.
+
+        The result is cached by the file's mtime and size. Raises OSError if
+        the file cannot be read.
+        """
+        st = file_path.stat()
+        key = str(file_path)
+        cached = self._component_cache.get(key)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+
+        with open(file_path, 'rb') as f:
+            if st.st_size < _MMAP_THRESHOLD:
+                scan = self._scan_component_data(f.read())
+            else:
+                # Large files are searched in place instead of copied into memory
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    scan = self._scan_component_data(mm)
+
+        self._component_cache[key] = (st.st_mtime_ns, st.st_size, scan)
+        return scan
+
+    @staticmethod
+    def _scan_component_data(data) -> Dict:
+        """Extract frontmatter and dependencies from file bytes or an mmap."""
+        scan = {
+            'has_frontmatter': data[:3] == b'---',
+            'frontmatter': None,
+            'frontmatter_error': None,
+            'depends_on': []
+        }
+
+        if scan['has_frontmatter']:
+            # The block runs up to the next '---'; only that slice is decoded
+            end = data.find(b'---', 3)
+            if end != -1:
+                try:
+                    parsed = yaml.load(data[3:end].decode('utf-8'), Loader=_YamlLoader)
+                    if isinstance(parsed, dict):
+                        scan['frontmatter'] = parsed
+                except yaml.YAMLError as e:
+                    scan['frontmatter_error'] = e
+
+        if data.find(b'depends_on:') != -1:
+            for match in _DEPENDS_RE.findall(data):
+                scan['depends_on'].extend(d.strip() for d in match.decode('utf-8').split(','))
+
+        return scan
+
+    def _prefetch_component_file(self, file_path: Path) -> None:
+        """Warm the component cache; read errors are reported by the serial pass."""
+        try:
+            self._scan_component_file(file_path)
+        except (OSError, ValueError):
+            pass
+
+    def _get_frontmatter(self, file_path: Path) -> Tuple[bool, Optional[Dict]]:
+        """Return (has_frontmatter, frontmatter dict) for a component file.
+
+        Raises OSError if the file cannot be read and yaml.YAMLError if the
+        frontmatter block is not valid YAML.
+        """
+        scan = self._scan_component_file(file_path)
+        if scan['frontmatter_error'] is not None:
+            raise scan['frontmatter_error']
+        return scan['has_frontmatter'], scan['frontmatter']
+
     def _validate_component_file_format(self, section: str, file_path: Path) -> bool:
         """Validate format of individual component file."""
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
+            has_frontmatter, frontmatter = self._get_frontmatter(file_path)
 
             # Check for YAML frontmatter
-            if content.startswith('---'):
-                try:
-                    # Extract and parse frontmatter
-                    parts = content.split('---', 2)
-                    if len(parts) >= 3:
-                        frontmatter = yaml.safe_load(parts[1])
-
-                        if isinstance(frontmatter, dict):
-                            # Validate required frontmatter fields
-                            required_fields = ['id', 'category', 'priority', 'version']
-                            for field in required_fields:
-                                if field not in frontmatter:
-                                    self.errors.append(ValidationError(
-                                        'warning', 'missing_frontmatter',
-                                        f"Missing {field} in frontmatter: {file_path.name}",
-                                        file_path=str(file_path)
-                                    ))
-
-                            # Validate category matches section
-                            if 'category' in frontmatter:
-                                expected_category = section.rstrip('s')  # Remove plural
-                                if frontmatter['category'] != expected_category:
-                                    self.errors.append(ValidationError(
-                                        'warning', 'category_mismatch',
-                                        f"Category '{frontmatter['category']}' doesn't match section '{section}': {file_path.name}",
-                                        file_path=str(file_path)
-                                    ))
-
-                            # Store priority for validation
-                            if 'priority' in frontmatter and 'id' in frontmatter:
-                                self.priority_map[frontmatter['id']] = frontmatter['priority']
-
-                except yaml.YAMLError as e:
-                    self.errors.append(ValidationError(
-                        'error', 'frontmatter_syntax',
-                        f"Invalid YAML frontmatter in {file_path.name}: {str(e)}",
-                        file_path=str(file_path)
-                    ))
-                    return False
+            if has_frontmatter:
+                if frontmatter is not None:
+                    # Validate required frontmatter fields
+                    required_fields = ['id', 'category', 'priority', 'version']
+                    for field in required_fields:
+                        if field not in frontmatter:
+                            self.errors.append(ValidationError(
+                                'warning', 'missing_frontmatter',
+                                f"Missing {field} in frontmatter: {file_path.name}",
+                                file_path=str(file_path)
+                            ))
+
+                    # Validate category matches section
+                    if 'category' in frontmatter:
+                        expected_category = section.rstrip('s')  # Remove plural
+                        if frontmatter['category'] != expected_category:
+                            self.errors.append(ValidationError(
+                                'warning', 'category_mismatch',
+                                f"Category '{frontmatter['category']}' doesn't match section '{section}': {file_path.name}",
+                                file_path=str(file_path)
+                            ))
+
+                    # Store priority for validation
+                    if 'priority' in frontmatter and 'id' in frontmatter:
+                        self.priority_map[frontmatter['id']] = frontmatter['priority']
+                    if 'priority' in frontmatter and 'category' in frontmatter:
+                        self._prio_index[(frontmatter['category'], frontmatter['priority'])].append({
+                            'priority': frontmatter['priority'],
+                            'id': frontmatter.get('id', file_path.name),
+                            'file': file_path.name
+                        })
             else:
                 self.errors.append(ValidationError(
                     'info', 'no_frontmatter',
@@ -354,6 +527,13 @@ class ConfigValidator:
                     fix_suggestion="Add YAML frontmatter with id, category, priority, version"
                 ))
 
+        except yaml.YAMLError as e:
+            self.errors.append(ValidationError(
+                'error', 'frontmatter_syntax',
+                f"Invalid YAML frontmatter in {file_path.name}: {str(e)}",
+                file_path=str(file_path)
+            ))
+            return False
         except Exception as e:
             self.errors.append(ValidationError(
                 'error', 'file_validation',
@@ -373,42 +553,16 @@ class ConfigValidator:
             ))
             return True
 
-        # Check for priority conflicts (same priority in same category)
-        category_priorities = defaultdict(list)
-
-        for file_path in self.file_references:
-            for path_str in self.file_references[file_path]:
-                path = Path(path_str)
-                try:
-                    with open(path, 'r') as f:
-                        content = f.read()
-                    if content.startswith('---'):
-                        parts = content.split('---', 2)
-                        if len(parts) >= 3:
-                            frontmatter = yaml.safe_load(parts[1])
-                            if isinstance(frontmatter, dict) and 'priority' in frontmatter and 'category' in frontmatter:
-                                category_priorities[frontmatter['category']].append({
-                                    'priority': frontmatter['priority'],
-                                    'id': frontmatter.get('id', path.name),
-                                    'file': path.name
-                                })
-                except:
-                    continue
-
-        # Check for duplicate priorities within categories
-        for category, items in category_priorities.items():
-            priority_counts = defaultdict(list)
-            for item in items:
-                priority_counts[item['priority']].append(item)
-
-            for priority, conflicting_items in priority_counts.items():
-                if len(conflicting_items) > 1:
-                    file_list = [item['file'] for item in conflicting_items]
-                    self.errors.append(ValidationError(
-                        'warning', 'priority_conflict',
-                        f"Priority {priority} used by multiple {category} files: {', '.join(file_list)}",
-                        fix_suggestion="Assign unique priorities within each category"
-                    ))
+        # Check for duplicate priorities within categories, using the
+        # index built by _validate_component_file_format
+        for (category, priority), conflicting_items in self._prio_index.items():
+            if len(conflicting_items) > 1:
+                file_list = [item['file'] for item in conflicting_items]
+                self.errors.append(ValidationError(
+                    'warning', 'priority_conflict',
+                    f"Priority {priority} used by multiple {category} files: {', '.join(file_list)}",
+                    fix_suggestion="Assign unique priorities within each category"
+                ))
 
         print("  ✅ Priority validation complete")
         return True
@@ -418,66 +572,115 @@ class ConfigValidator:
         # This is a simplified dependency check
         # In a full implementation, you'd parse actual dependencies from files
 
-        dependencies = {}
+        # Component name -> its dependencies as an insertion-ordered set, so
+        # self-dependency checks are lookups rather than list scans
+        dependencies: Dict[str, Dict[str, None]] = {}
 
         # Extract dependency information from files (simplified)
-        for section, file_paths in self.file_references.items():
-            for file_path_str in file_paths:
-                file_path = Path(file_path_str)
-                try:
-                    with open(file_path, 'r') as f:
-                        content = f.read()
-
-                    # Look for dependency patterns (this is simplified)
-                    deps = []
-                    if 'depends_on:' in content:
-                        # Extract dependencies (simplified regex)
-                        dep_matches = re.findall(r'depends_on:\s*(.+)', content)
-                        for match in dep_matches:
-                            deps.extend([d.strip() for d in match.split(',')])
-
-                    if deps:
-                        dependencies[file_path.stem] = deps
-
-                except:
-                    continue
-
-        # Check for circular dependencies using DFS
-        def has_cycle(node, visited, rec_stack):
-            visited.add(node)
-            rec_stack.add(node)
-
-            for neighbor in dependencies.get(node, []):
-                if neighbor not in visited:
-                    if has_cycle(neighbor, visited, rec_stack):
-                        return True
-                elif neighbor in rec_stack:
-                    return True
-
-            rec_stack.remove(node)
-            return False
+        # Missing, non-file and unreadable references are already reported
+        for file_path in self._valid_references:
+            try:
+                # Dependencies were extracted when the file was first scanned
+                deps = self._scan_component_file(file_path)['depends_on']
+                if deps:
+                    # Files sharing a stem are one node; merge their edges
+                    dependencies.setdefault(file_path.stem, {}).update(dict.fromkeys(deps))
+
+            except (OSError, ValueError) as e:
+                self.errors.append(ValidationError(
+                    'warning', 'dependency_scan_failed',
+                    f"Could not read dependencies from {file_path.name}: {str(e)}",
+                    file_path=str(file_path)
+                ))
+                continue
+
+        # Tarjan emits each component only after every component it depends
+        # on, so its output is already a topological order of the condensed
+        # graph: cycles are collapsed into one position instead of blocking it
+        components = self._strongly_connected_components(dependencies)
+        self.topo_order = [node for component in components for node in component]
+
+        # Report every cycle once, one per strongly connected component,
+        # ordered by each component's smallest node name
+        cycles = sorted(
+            component for component in components
+            if len(component) > 1 or component[0] in dependencies.get(component[0], ())
+        )
+        for cycle in cycles:
+            self.errors.append(ValidationError(
+                'error', 'circular_dependency',
+                f"Circular dependency detected involving: {', '.join(cycle)}",
+                fix_suggestion="Review and resolve circular dependencies"
+            ))
 
-        visited = set()
-        for node in dependencies:
-            if node not in visited:
-                if has_cycle(node, visited, set()):
-                    self.errors.append(ValidationError(
-                        'error', 'circular_dependency',
-                        f"Circular dependency detected involving: {node}",
-                        fix_suggestion="Review and resolve circular dependencies"
-                    ))
-                    return False
+        if cycles:
+            return False
 
         print("  ✅ Dependency validation complete")
         return True
 
+    @staticmethod
+    def _strongly_connected_components(graph: Dict[str, Dict[str, None]]) -> List[List[str]]:
+        """Split the dependency graph into SCCs with an iterative Tarjan pass.
+
+        Components are returned as sorted lists of names, dependencies before
+        the components that depend on them.
+        """
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        components: List[List[str]] = []
+
+        for root in graph:
+            if root in index:
+                continue
+
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(graph.get(root, ())))]
+
+            while work:
+                node, neighbors = work[-1]
+                for neighbor in neighbors:
+                    if neighbor not in index:
+                        # Descend; resume this node's neighbors afterwards
+                        index[neighbor] = lowlink[neighbor] = len(index)
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(graph.get(neighbor, ()))))
+                        break
+                    if neighbor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[neighbor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(sorted(component))
+
+        return components
+
     def _validate_best_practices(self):
         """Check for best practice violations."""
         if not self.config_data:
             return
 
+        top = self.config_data
+        system_config = top.get('system') or {}
+
         # Check for version information
-        if 'system' not in self.config_data or 'version' not in self.config_data.get('system', {}):
+        if 'version' not in system_config:
             self.errors.append(ValidationError(
                 'info', 'best_practice',
                 "Consider adding version information in system.version",
@@ -485,7 +688,7 @@ class ConfigValidator:
             ))
 
         # Check for quality gates configuration
-        if 'quality_gates' not in self.config_data:
+        if 'quality_gates' not in top:
             self.errors.append(ValidationError(
                 'info', 'best_practice',
                 "Consider adding quality_gates configuration for automated validation",
@@ -493,13 +696,105 @@ class ConfigValidator:
             ))
 
         # Check for monitoring configuration
-        if 'monitoring' not in self.config_data:
+        if 'monitoring' not in top:
             self.errors.append(ValidationError(
                 'info', 'best_practice',
                 "Consider adding monitoring configuration for operational visibility",
                 fix_suggestion="Add monitoring section with metrics and logging config"
             ))
 
+    def result_cache_file(self, cache_dir: Path = _RESULT_CACHE_DIR) -> Optional[Path]:
+        """Cache file for this configuration's results, or None if it cannot be keyed.
+
+        The key hashes the config bytes, this script, the kind of every
+        expected directory and the mode, readability and contents of every
+        referenced file, so any change that could alter the results
+        invalidates the stored entry.
+        """
+        try:
+            config_bytes = self.config_file.read_bytes()
+            config_data = yaml.load(config_bytes, Loader=_YamlLoader)
+        except (OSError, yaml.YAMLError):
+            return None
+        if not isinstance(config_data, dict):
+            return None
+        self._preloaded_config = config_data
+
+        dirs = [self.root / d for d in self.REQUIRED_DIRS + self.OPTIONAL_DIRS]
+        files = [Path(__file__)]
+        files.extend(self._resolve_reference(ref) for _, ref in self._collect_file_references(config_data))
+
+        digest = hashlib.blake2b(_RESULT_CACHE_VERSION, digest_size=16)
+        digest.update(str(self.root).encode('utf-8'))
+        digest.update(config_bytes)
+        for path in dirs:
+            try:
+                entry = f"{path}\0{stat.S_IFMT(path.stat().st_mode)}\n"
+            except OSError:
+                entry = f"{path}\0-\n"
+            digest.update(entry.encode('utf-8'))
+        for path in files:
+            # Hash contents rather than mtime/size, which can miss an edit
+            try:
+                st = path.stat()
+                readable = os.access(path, os.R_OK)
+                digest.update(f"{path}\0{st.st_mode}\0{readable}\0{st.st_size}\n".encode('utf-8'))
+                if stat.S_ISREG(st.st_mode) and readable:
+                    digest.update(hashlib.blake2b(path.read_bytes(), digest_size=16).digest())
+            except OSError:
+                digest.update(f"{path}\0-\n".encode('utf-8'))
+        self._result_cache_key = digest.hexdigest()
+
+        # One file per project root, overwritten on each run
+        root_hash = hashlib.blake2b(str(self.root).encode('utf-8'), digest_size=16).hexdigest()
+        return cache_dir / f"validate-{root_hash}.json"
+
+    def load_cached_results(self, cache_file: Path) -> Optional[bool]:
+        """Restore results from a cache file; returns the cached success or None on a miss.
+
+        Anything unreadable, malformed or stored under a different key is a miss.
+        """
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = json_utils.loads(f.read())
+            if cached['key'] != self._result_cache_key:
+                return None
+
+            errors = []
+            for item in cached['errors']:
+                error = ValidationError(item['severity'], item['category'], item['message'],
+                                        item['file_path'], item['fix_suggestion'])
+                error.timestamp = item['timestamp']
+                errors.append(error)
+            file_references = defaultdict(set, {
+                section: {Path(p) for p in paths}
+                for section, paths in cached['file_references'].items()
+            })
+            priority_map = dict(cached['priority_map'])
+            success = bool(cached['success'])
+        except Exception:
+            return None
+
+        self.errors = errors
+        self.file_references = file_references
+        self.priority_map = priority_map
+        return success
+
+    def save_cached_results(self, cache_file: Path, success: bool):
+        """Store the results of a completed validation run."""
+        try:
+            data = json_utils.dumps({
+                'key': self._result_cache_key,
+                'success': success,
+                'errors': [error.to_dict() for error in self.errors],
+                'file_references': {k: [str(p) for p in v] for k, v in self.file_references.items()},
+                'priority_map': self.priority_map
+            })
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            json_utils.write_atomic(cache_file, data)
+        except (OSError, TypeError, ValueError):
+            pass  # Caching is best effort
+
     def _has_critical_errors(self) -> bool:
         """Check if there are any critical errors."""
         return any(error.severity == 'critical' for error in self.errors)
@@ -552,7 +847,7 @@ class ConfigValidator:
 
         if detailed:
             report['errors'] = [error.to_dict() for error in self.errors]
-            report['file_references'] = {k: list(v) for k, v in self.file_references.items()}
+            report['file_references'] = {k: [str(p) for p in v] for k, v in self.file_references.items()}
             report['priority_map'] = self.priority_map
 
         return report
@@ -563,57 +858,60 @@ class ConfigValidator:
         for error in self.errors:
             error_counts[error.severity] += 1
 
-        print("\n" + "="*60)
-        print("📊 VALIDATION SUMMARY")
-        print("="*60)
+        # Collect the summary and write it in one go
+        out = ["\n" + "="*60, "📊 VALIDATION SUMMARY", "="*60]
 
         if not self.errors:
-            print("🎉 All validations passed! Configuration is healthy.")
+            out.append("🎉 All validations passed! Configuration is healthy.")
+            sys.stdout.write("\n".join(out) + "\n")
             return
 
-        print(f"Total issues found: {len(self.errors)}")
+        out.append(f"Total issues found: {len(self.errors)}")
         if error_counts['critical']:
-            print(f"  ❌ Critical: {error_counts['critical']}")
+            out.append(f"  ❌ Critical: {error_counts['critical']}")
         if error_counts['error']:
-            print(f"  🔴 Errors: {error_counts['error']}")
+            out.append(f"  🔴 Errors: {error_counts['error']}")
         if error_counts['warning']:
-            print(f"  ⚠️  Warnings: {error_counts['warning']}")
+            out.append(f"  ⚠️  Warnings: {error_counts['warning']}")
         if error_counts['info']:
-            print(f"  ℹ️  Info: {error_counts['info']}")
+            out.append(f"  ℹ️  Info: {error_counts['info']}")
 
         # Print errors by category
-        print("\n📋 ISSUES BY CATEGORY:")
+        out.append("\n📋 ISSUES BY CATEGORY:")
         categories = defaultdict(list)
         for error in self.errors:
             categories[error.category].append(error)
 
         for category, errors in categories.items():
-            print(f"\n{category.upper()}:")
+            out.append(f"\n{category.upper()}:")
             for error in errors[:5]:  # Limit to first 5 per category
-                icon = {'critical': '❌', 'error': '🔴', 'warning': '⚠️', 'info': 'ℹ️'}[error.severity]
-                print(f"  {icon} {error.message}")
+                out.append(f"  {_ICONS[error.severity]} {error.message}")
                 if error.fix_suggestion:
-                    print(f"     💡 Fix: {error.fix_suggestion}")
+                    out.append(f"     💡 Fix: {error.fix_suggestion}")
 
             if len(errors) > 5:
-                print(f"     ... and {len(errors) - 5} more")
+                out.append(f"     ... and {len(errors) - 5} more")
 
         # Overall status
-        print("\n🎯 OVERALL STATUS:")
+        out.append("\n🎯 OVERALL STATUS:")
         if self._has_critical_errors():
-            print("❌ CRITICAL ISSUES FOUND - System may not function properly")
+            out.append("❌ CRITICAL ISSUES FOUND - System may not function properly")
         elif error_counts['error'] > 0:
-            print("🔴 ERRORS FOUND - Some features may not work correctly")
+            out.append("🔴 ERRORS FOUND - Some features may not work correctly")
         elif error_counts['warning'] > 0:
-            print("⚠️  WARNINGS FOUND - System functional but improvements recommended")
+            out.append("⚠️  WARNINGS FOUND - System functional but improvements recommended")
         else:
-            print("✅ NO MAJOR ISSUES - Only informational items found")
+            out.append("✅ NO MAJOR ISSUES - Only informational items found")
+
+        sys.stdout.write("\n".join(out) + "\n")
 
 
 def main():
     """Main entry point for configuration validation."""
     parser = argparse.ArgumentParser(
-        description="Validate ClaudeCode configuration integrity"
+        description="Validate ClaudeCode configuration integrity",
+        epilog="YAML is parsed with libyaml when PyYAML was built against it "
+               "(install libyaml-dev before PyYAML); otherwise the pure-Python loader is used."
     )
     parser.add_argument("--fix-auto", action="store_true",
                        help="Attempt to automatically fix common issues")
@@ -624,6 +922,8 @@ def main():
     parser.add_argument("--claude-code-root",
                        help="Path to ClaudeCode root directory",
                        default=".")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Ignore and do not update cached validation results")
 
     args = parser.parse_args()
 
@@ -631,8 +931,17 @@ def main():
     claude_code_root = Path(args.claude_code_root).resolve()
     validator = ConfigValidator(claude_code_root)
 
-    # Run validation
-    success = validator.validate_all()
+    # Reuse results from an identical earlier run unless fixes may change the tree
+    cache_file = None if args.no_cache or args.fix_auto else validator.result_cache_file()
+    success = validator.load_cached_results(cache_file) if cache_file else None
+
+    if success is None:
+        # Run validation
+        success = validator.validate_all()
+        if cache_file:
+            validator.save_cached_results(cache_file, success)
+    else:
+        print("♻️  Configuration unchanged since last validation, using cached results")
 
     # Auto-fix if requested
     if args.fix_auto:
@@ -648,8 +957,8 @@ def main():
     # Export report if requested
     if args.export_report:
         report = validator.generate_report(detailed=args.detailed)
-        with open(args.export_report, 'w') as f:
-            json.dump(report, f, indent=2)
+        with open(args.export_report, 'wb') as f:
+            f.write(json_utils.dumps(report, indent=True))
         print(f"\n📄 Report exported to: {args.export_report}")
 
     # Exit with appropriate code